@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Startup time of the token and get_devices modules.
+
+  Each run is a fresh python process, same as an ansible task,
+  and measures
+    import   time to import module_utils of the module
+    first    time of the first execute_module_*() call
+    total    wall clock of the process
+
+  python3 benchmarks/startup_benchmark.py --sandbox always-on-lab
+  python3 benchmarks/startup_benchmark.py --host 10.10.20.85 --username admin --password xxx
+
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MODULE_UTILS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'plugins', 'module_utils')
+
+# module name -> (module_utils, class, method)
+TARGETS = {
+  'token': ('dnac_rest_client', 'DnacRestClient', 'execute_module_token'),
+  'get_devices': ('dnac_devices', 'DnacDevices', 'execute_module_get_devices')
+}
+
+SNIPPET = '''
+import json, sys, time
+sys.path.insert(0, {module_utils!r})
+t0 = time.perf_counter()
+from {module} import {cls}
+t1 = time.perf_counter()
+result = {cls}({params!r}).{method}()
+t2 = time.perf_counter()
+print(json.dumps({{
+  'import': t1 - t0,
+  'first': t2 - t1,
+  'failed': result.get('failed'),
+  'requests_imported': 'requests' in sys.modules,
+  'tabulate_imported': 'tabulate' in sys.modules
+}}))
+'''
+
+
+def run_once(name, params):
+  """run the module in a new process
+
+  Arguments:
+      name {str} -- key of TARGETS
+      params {dict} -- module params
+
+  Returns:
+      dict -- measured values
+  """
+  module, cls, method = TARGETS[name]
+  code = SNIPPET.format(module_utils=MODULE_UTILS, module=module, cls=cls, method=method, params=params)
+  start = time.perf_counter()
+  proc = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True)
+  elapsed = time.perf_counter() - start
+  measured = json.loads(proc.stdout.decode().strip().splitlines()[-1])
+  measured['total'] = elapsed
+  return measured
+
+
+def main():
+  """main function"""
+  parser = argparse.ArgumentParser(description='startup time of iida.dnac modules')
+  parser.add_argument('--sandbox', help='name in dnac_sandbox.py')
+  parser.add_argument('--host')
+  parser.add_argument('--port', type=int, default=443)
+  parser.add_argument('--username')
+  parser.add_argument('--password')
+  parser.add_argument('--log-dir', default='./log')
+  parser.add_argument('--runs', type=int, default=10)
+  parser.add_argument('--modules', nargs='+', default=list(TARGETS), choices=list(TARGETS))
+  args = parser.parse_args()
+
+  if args.sandbox:
+    sys.path.insert(0, MODULE_UTILS)
+    from dnac_sandbox import sandbox_params  # pylint: disable=import-outside-toplevel
+    params = dict(sandbox_params.get(args.sandbox))
+  elif args.host:
+    params = {'host': args.host, 'port': args.port, 'username': args.username, 'password': args.password}
+  else:
+    parser.error('--sandbox or --host is required')
+  params['log_dir'] = args.log_dir
+
+  # warm up, the token is cached after this
+  for name in args.modules:
+    run_once(name, params)
+
+  print('{:<12} {:>10} {:>10} {:>10}  {}'.format('module', 'import ms', 'first ms', 'total ms', 'lazy'))
+  for name in args.modules:
+    runs = [run_once(name, params) for _ in range(args.runs)]
+    failed = any(r.get('failed') for r in runs)
+    lazy = []
+    if not runs[-1].get('requests_imported'):
+      lazy.append('requests')
+    if not runs[-1].get('tabulate_imported'):
+      lazy.append('tabulate')
+    print('{:<12} {:>10.1f} {:>10.1f} {:>10.1f}  {}{}'.format(
+      name,
+      statistics.median(r['import'] for r in runs) * 1000,
+      statistics.median(r['first'] for r in runs) * 1000,
+      statistics.median(r['total'] for r in runs) * 1000,
+      ','.join(lazy) or '-',
+      '  (failed)' if failed else ''))
+
+  return 0
+
+
+if __name__ == '__main__':
+  sys.exit(main())
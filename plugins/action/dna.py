@@ -7,9 +7,12 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 
+import json
 import os
 import time
 
+from ansible.module_utils.connection import Connection
+from ansible.module_utils.parsing.convert_bool import boolean
 from ansible.plugins.action.normal import ActionModule
 
 try:
@@ -21,6 +24,14 @@ except ImportError:
   display = Display()
 
 
+# delegate_to targets which are this controller itself
+LOCAL_HOSTS = ('localhost', '127.0.0.1', '::1')
+
+# clients reused by the tasks and loop items run in this worker process
+# key: (pid, class name, common params in json)
+_CLIENTS = {}
+
+
 class DnaActionModule(ActionModule):
 
   def get_working_path(self):
@@ -42,6 +53,125 @@ class DnaActionModule(ActionModule):
     return filename
 
 
+  def run_remote(self, task_vars):
+    """decide whether the task is run as a module on the delegated host
+
+    The task arg run_remote forces it, true or false.
+    Otherwise the module is sent to the delegated host only if delegate_to targets a remote host,
+    such as a bastion which can reach DNA Center.
+    The run_remote arg is removed from self._task.args, because the module does not know it.
+
+    Arguments:
+        task_vars {dict} -- task vars
+
+    Returns:
+        bool -- True if run as a module, False if run in this action plugin
+    """
+    switch = self._task.args.pop('run_remote', None)
+    if switch is not None:
+      return boolean(switch, strict=False)
+
+    delegate_to = self._task.delegate_to
+    if not delegate_to or delegate_to in LOCAL_HOSTS:
+      return False
+
+    delegated_vars = (task_vars.get('ansible_delegated_vars') or {}).get(delegate_to) or {}
+    if delegated_vars.get('ansible_connection') == 'local':
+      return False
+
+    return True
+
+
+  def validate_args(self, argument_spec):
+    """validate and coerce self._task.args in the same way as AnsibleModule does
+
+    Strings such as page_size: "100" or task_wait: "false" are converted to the type of the argument,
+    comma separated strings are split for list, and defaults are filled.
+
+    Arguments:
+        argument_spec {dict} -- argument spec of the module
+
+    Raises:
+        AnsibleActionFail -- if the args are not valid
+
+    Returns:
+        dict -- validated args, None if this ansible can not validate args on the controller
+    """
+    # ActionBase.validate_argument_spec() is available since ansible-core 2.11
+    if not hasattr(self, 'validate_argument_spec'):
+      return None
+    _, args = self.validate_argument_spec(argument_spec=argument_spec)
+    return args
+
+
+  def get_client(self, client_class, argument_spec):
+    """get client object for this task
+
+    A client created by the previous task or loop item in this worker process is reused,
+    if it was created with the same common params, that is, same host, port, username and so on.
+    The reused client keeps its token, session and device index on memory.
+
+    Arguments:
+        client_class {class} -- DnacRestClient or its subclass
+        argument_spec {dict} -- argument spec of the module, the task args are validated by it
+
+    Raises:
+        AnsibleActionFail -- if the args are not valid
+
+    Returns:
+        DnacRestClient -- client object, None if the args can not be validated on the controller
+    """
+    args = self.validate_args(argument_spec)
+    if args is None:
+      return None
+
+    common = {key: args.get(key) for key in client_class.argument_spec}
+    key = (os.getpid(), client_class.__name__, json.dumps(common, sort_keys=True, default=str))
+
+    drc = _CLIENTS.get(key)
+    if drc is None:
+      drc = client_class(args)
+      _CLIENTS[key] = drc
+      self._client_reused = False
+    else:
+      drc.update_params(args)
+      self._client_reused = True
+
+    return self.set_connection(drc)
+
+
+  def timing(self, start, run_as_module):
+    """timing of the task, to be added to the result
+
+    Arguments:
+        start {float} -- time.time() when the task started
+        run_as_module {bool} -- True if run as a module
+
+    Returns:
+        dict -- mode, elapsed seconds and whether the client was reused
+    """
+    return {
+      'mode': 'module' if run_as_module else 'controller',
+      'elapsed': round(time.time() - start, 3),
+      'client_reused': bool(getattr(self, '_client_reused', False)) and not run_as_module
+    }
+
+
+  def set_connection(self, drc):
+    """send requests of drc via the persistent connection if ansible_connection is httpapi
+
+    Arguments:
+        drc {DnacRestClient} -- client object
+    """
+    # network_cli and netconf have socket_path too, but they do not speak rest api
+    if self._play_context.connection.split('.')[-1] != 'httpapi':
+      return drc
+    socket_path = getattr(self._connection, 'socket_path', None)
+    if socket_path:
+      drc.connection(Connection(socket_path))
+    return drc
+
+
   def complement_task_args_by_hostvars(self, hostvars):
     """complement self._task.args by inventory hostvars
 
@@ -7,6 +7,7 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import os
+import time
 
 # import from collection
 from ansible_collections.iida.dnac.plugins.action.dna import DnaActionModule
@@ -26,8 +27,10 @@ class ActionModule(DnaActionModule):
   def run(self, tmp=None, task_vars=None):
     del tmp  # tmp no longer has any effect
 
-    # if delegate_to is specified, we must run in module
-    run_as_module = bool(hasattr(self._play_context, 'delegate_to'))
+    start = time.time()
+
+    # run in this process unless delegate_to targets a remote host, see run_remote()
+    run_as_module = self.run_remote(task_vars)
 
     #
     # pre process
@@ -48,10 +51,13 @@ class ActionModule(DnaActionModule):
     #
     # RUN THE MODULE
     #
-    if run_as_module:
+    # the args are validated against the argument spec of the module before the client is made,
+    # older ansible which can not validate them on the controller runs the module instead
+    drc = None if run_as_module else self.get_client(DnacRestClient, DnacRestClient.get_devices_argument_spec)
+    if drc is None:
+      run_as_module = True
       result = super(ActionModule, self).run(task_vars=task_vars)
     else:
-      drc = DnacRestClient(self._task.args)
       result = drc.execute_module_get_devices(self._play_context.check_mode)
 
     #
@@ -63,4 +69,6 @@ class ActionModule(DnaActionModule):
       result['log_path'] = log_path
       del result['__log__']
 
+    result['timing'] = self.timing(start, run_as_module)
+
     return result
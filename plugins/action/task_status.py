@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+
+# (c) Takamitsu IIDA (@takamitsu-iida)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import time
+
+# import from collection
+from ansible_collections.iida.dnac.plugins.action.dna import DnaActionModule
+from ansible_collections.iida.dnac.plugins.module_utils.dnac_rest_client import DnacRestClient
+
+try:
+  # pylint: disable=unused-import
+  from __main__ import display
+except ImportError:
+  # pylint: disable=ungrouped-imports
+  from ansible.utils.display import Display
+  display = Display()
+
+
+class ActionModule(DnaActionModule):
+
+  def run(self, tmp=None, task_vars=None):
+    del tmp  # tmp no longer has any effect
+
+    start = time.time()
+
+    # run in this process unless delegate_to targets a remote host, see run_remote()
+    run_as_module = self.run_remote(task_vars)
+
+    #
+    # pre process
+    #
+
+    # get hostvars
+    inventory_hostname = task_vars.get('inventory_hostname')
+    hostvars = task_vars['hostvars'].get(inventory_hostname)
+
+    # complement self._task.args by hostvars
+    self.complement_task_args_by_hostvars(hostvars)
+
+    # set log_dir
+    if not self._task.args.get('log_dir'):
+      cwd = self.get_working_path()
+      self._task.args['log_dir'] = os.path.join(cwd, 'log')
+
+    #
+    # RUN THE MODULE
+    #
+    # the args are validated against the argument spec of the module before the client is made,
+    # older ansible which can not validate them on the controller runs the module instead
+    drc = None if run_as_module else self.get_client(DnacRestClient, DnacRestClient.task_status_argument_spec)
+    if drc is None:
+      run_as_module = True
+      result = super(ActionModule, self).run(task_vars=task_vars)
+    else:
+      result = drc.execute_module_task_status(self._play_context.check_mode)
+
+    #
+    # post process
+    #
+
+    if self._task.args.get('log') and '__log__' in result:
+      log_path = self.write_log(inventory_hostname, result.get('__log__'))
+      result['log_path'] = log_path
+      del result['__log__']
+
+    result['timing'] = self.timing(start, run_as_module)
+
+    return result
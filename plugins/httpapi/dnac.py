@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+
+# (c) Takamitsu IIDA (@takamitsu-iida)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+author: Takamitsu IIDA (@takamitsu-iida)
+httpapi: dnac
+short_description: HttpApi Plugin for Cisco DNA Center
+description:
+  - This HttpApi plugin provides methods to connect to Cisco DNA Center over a HTTP(S)-based api.
+  - The auth token and the https connection are kept in the persistent connection process,
+    and shared by all tasks against the same controller in the play.
+version_added: "2.9"
+'''
+
+EXAMPLES = '''
+# host_vars/sandboxdnac2/vars.yml
+ansible_connection: httpapi
+ansible_network_os: iida.dnac.dnac
+ansible_host: sandboxdnac2.cisco.com
+ansible_user: devnetuser
+ansible_password: Cisco123!
+ansible_httpapi_use_ssl: true
+ansible_httpapi_validate_certs: false
+'''
+
+import json
+
+from ansible.module_utils._text import to_text
+from ansible.module_utils.connection import ConnectionError  # pylint: disable=redefined-builtin
+from ansible.module_utils.six.moves.urllib.parse import urlencode
+from ansible.plugins.httpapi import HttpApiBase
+
+BASE_HEADERS = {
+  'Accept': "application/json",
+  'Content-Type': "application/json"
+}
+
+
+class HttpApi(HttpApiBase):
+
+  # Cisco DNA Center version 1.2.6 and above
+  API_PATH_TOKEN = '/dna/system/api/v1/auth/token'
+
+  def __init__(self, connection):
+    super(HttpApi, self).__init__(connection)
+
+    # login is retried only once per request
+    self._login_retried = False
+
+
+  def login(self, username, password):
+    """get token with basic auth, the token is sent as x-auth-token by following requests"""
+    # basic auth is used while _auth is empty
+    self.connection._auth = None
+    _, response_data = self.connection.send(self.API_PATH_TOKEN, None, method='POST', headers=BASE_HEADERS)
+
+    try:
+      token = json.loads(to_text(response_data.getvalue())).get('Token')
+    except ValueError:
+      raise ConnectionError('invalid response from {}'.format(self.API_PATH_TOKEN))
+
+    if not token:
+      raise ConnectionError('failed to get token from {}'.format(self.API_PATH_TOKEN))
+
+    self.connection._auth = {'x-auth-token': token}
+
+
+  def logout(self):
+    # dna center has no api to revoke the token
+    self.connection._auth = None
+
+
+  def update_auth(self, response, response_text):
+    # keep the token, cookies are not used
+    return None
+
+
+  def handle_httperror(self, exc):
+    """login again if the token is expired or revoked
+
+    Returns:
+        True to retry the request, otherwise the error is returned to the caller as the response
+    """
+    if exc.code == 401 and self.connection._auth and not self._login_retried:
+      self._login_retried = True
+      self.login(self.connection.get_option('remote_user'), self.connection.get_option('password'))
+      return True
+
+    return exc
+
+
+  def get_token(self):
+    """token of this persistent connection, login if not yet
+
+    Returns:
+        str -- token string
+    """
+    if not self.connection._auth:
+      # login on connect
+      self.connection._connect()
+    if not self.connection._auth:
+      self.login(self.connection.get_option('remote_user'), self.connection.get_option('password'))
+    return self.connection._auth.get('x-auth-token')
+
+
+  def send_request(self, api_path, method='GET', params=None, data=None, headers=None):
+    """send request over the persistent connection
+
+    Arguments:
+        api_path {str} -- api path
+
+    Keyword Arguments:
+        method {str} -- http method (default: {'GET'})
+        params {dict or list} -- query parameters (default: {None})
+        data {object} -- request body, sent as json (default: {None})
+        headers {dict} -- additional headers (default: {None})
+
+    Returns:
+        dict -- status_code, url, headers and text of the response
+    """
+    path = '/' + api_path.lstrip('/')
+    if params:
+      # list of tuples arrives as list of lists over json-rpc
+      if isinstance(params, list):
+        params = [tuple(param) for param in params]
+      path += ('&' if '?' in path else '?') + urlencode(params, doseq=True)
+
+    request_headers = dict(BASE_HEADERS)
+    request_headers.update(headers or {})
+
+    body = None if data is None else json.dumps(data)
+
+    self._login_retried = False
+    response, response_data = self.connection.send(path, body, method=method, headers=request_headers)
+
+    return {
+      'status_code': response.getcode(),
+      'url': response.geturl(),
+      'headers': dict(response.info().items()),
+      'text': to_text(response_data.getvalue())
+    }
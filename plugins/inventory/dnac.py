@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+
+# (c) Takamitsu IIDA (@takamitsu-iida)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+author: Takamitsu IIDA (@takamitsu-iida)
+name: dnac
+plugin_type: inventory
+short_description: Cisco DNA Center inventory source
+description:
+  - Get network devices from Cisco DNA Center and add them to the inventory.
+  - Devices are grouped by site, role, family and platform.
+  - The site groups are nested along the site hierarchy, ex site_global_area1 is a child of site_global.
+  - Uses a YAML configuration file that ends with dnac.yml or dnac.yaml.
+  - Enable the inventory cache, because pulling all devices on every start is slow.
+version_added: "2.9"
+extends_documentation_fragment:
+  - inventory_cache
+  - constructed
+options:
+  plugin:
+    description: token that ensures this is a source file for the plugin.
+    required: true
+    choices: ['iida.dnac.dnac']
+  host:
+    description: address of DNA Center.
+    required: true
+    env:
+      - name: DNAC_HOST
+  port:
+    description: port of DNA Center.
+    default: 443
+    type: int
+    env:
+      - name: DNAC_PORT
+  username:
+    description: username of DNA Center.
+    env:
+      - name: DNAC_USERNAME
+  password:
+    description: password of DNA Center.
+    env:
+      - name: DNAC_PASSWORD
+  timeout:
+    description: timeout of each request in seconds.
+    default: 30
+    type: int
+  http_proxy:
+    description: proxy to reach DNA Center.
+  log_dir:
+    description:
+      - directory of the token cache and the device index.
+      - the device index written here is also used by the get_devices module.
+    type: path
+  workers:
+    description: number of threads to fetch pages of devices and membership of sites.
+    default: 8
+    type: int
+  page_size:
+    description: number of devices in a page.
+    default: 500
+    type: int
+  hostname_key:
+    description: key of the device used as the inventory hostname, managementIpAddress is used if the key is empty.
+    default: hostname
+    choices: ['hostname', 'managementIpAddress', 'id']
+  group_by:
+    description: groups to be created.
+    type: list
+    default: ['site', 'role', 'family', 'platform']
+'''
+
+EXAMPLES = '''
+# dnac.yml
+plugin: iida.dnac.dnac
+host: sandboxdnac2.cisco.com
+username: devnetuser
+password: Cisco123!
+cache: true
+cache_plugin: jsonfile
+cache_connection: ./log/inventory
+cache_timeout: 3600
+keyed_groups:
+  - key: dnac_device.softwareVersion
+    prefix: version
+'''
+
+import re
+
+from ansible.errors import AnsibleError
+from ansible.plugins.inventory import BaseInventoryPlugin, Constructable, Cacheable
+
+# import from collection
+from ansible_collections.iida.dnac.plugins.module_utils.dnac import Dnac
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+
+  NAME = 'iida.dnac.dnac'
+
+  # options passed to DnacRestClient as they are
+  CLIENT_OPTIONS = ('host', 'port', 'username', 'password', 'timeout', 'http_proxy', 'log_dir', 'workers', 'page_size')
+
+
+  def verify_file(self, path):
+    """return true/false if this is possibly a valid file for this plugin to consume"""
+    if super(InventoryModule, self).verify_file(path):
+      return path.endswith(('dnac.yml', 'dnac.yaml'))
+    return False
+
+
+  def parse(self, inventory, loader, path, cache=True):
+    super(InventoryModule, self).parse(inventory, loader, path, cache)
+
+    self._read_config_data(path)
+
+    cache_key = self.get_cache_key(path)
+
+    # cache is the argument, false when --flush-cache is given
+    # self.get_option('cache') is the setting of the user
+    user_cache_setting = self.get_option('cache')
+    attempt_to_read_cache = user_cache_setting and cache
+    cache_needs_update = user_cache_setting and not cache
+
+    data = None
+    if attempt_to_read_cache:
+      try:
+        data = self._cache[cache_key]
+      except KeyError:
+        cache_needs_update = True
+
+    if data is None:
+      data = self.fetch_inventory_data()
+
+    if cache_needs_update:
+      self._cache[cache_key] = data
+
+    self.populate(data)
+
+
+  def fetch_inventory_data(self):
+    """get devices and site membership from DNA Center
+
+    Devices are fetched page by page concurrently, or taken from the device index if it is fresh.
+    Membership of the sites are fetched concurrently.
+
+    Returns:
+        dict -- {'devices': [device, ...], 'sites': {groupNameHierarchy: [device id, ...]}}
+    """
+    params = {}
+    for name in self.CLIENT_OPTIONS:
+      value = self.get_option(name)
+      if value is not None:
+        params[name] = value
+
+    try:
+      drc = Dnac(params)
+    except Exception as e:
+      raise AnsibleError('failed to create client: {}'.format(e))
+
+    index = drc.device_index()
+    device_list = index.devices if index is not None else drc.get_device_list()
+    if device_list is None:
+      raise AnsibleError('failed to get device list from {}'.format(params.get('host')))
+
+    sites = {}
+    if 'site' in self.get_option('group_by'):
+      sites = drc.get_site_members(drc.get_site_names_13())
+
+    return {'devices': list(device_list), 'sites': sites}
+
+
+  def get_inventory_hostname(self, device):
+    """inventory hostname of the device"""
+    return device.get(self.get_option('hostname_key')) or device.get('managementIpAddress')
+
+
+  @staticmethod
+  def group_name(prefix, value):
+    """group name safe for ansible, ex ('site', 'Global/Area 1') -> 'site_global_area_1'"""
+    return re.sub(r'[^a-z0-9_]', '_', '{}_{}'.format(prefix, value).lower())
+
+
+  def add_device_to_group(self, group_name, hostname):
+    """add host to the group, the group is created if not exists"""
+    self.inventory.add_group(group_name)
+    self.inventory.add_child(group_name, hostname)
+    return group_name
+
+
+  def populate(self, data):
+    """add hosts and groups to the inventory
+
+    Arguments:
+        data {dict} -- output of fetch_inventory_data()
+    """
+    group_by = self.get_option('group_by')
+    strict = self.get_option('strict')
+
+    # device id -> inventory hostname
+    hostnames = {}
+
+    for device in data.get('devices') or []:
+      hostname = self.get_inventory_hostname(device)
+      if not hostname:
+        continue
+      hostnames[device.get('id')] = hostname
+
+      self.inventory.add_host(hostname)
+      self.inventory.set_variable(hostname, 'ansible_host', device.get('managementIpAddress'))
+      self.inventory.set_variable(hostname, 'dnac_device_id', device.get('id'))
+      self.inventory.set_variable(hostname, 'dnac_device', device)
+
+      if 'role' in group_by and device.get('role'):
+        self.add_device_to_group(self.group_name('role', device.get('role')), hostname)
+
+      if 'family' in group_by and device.get('family'):
+        self.add_device_to_group(self.group_name('family', device.get('family')), hostname)
+
+      # in case of switch stacks, 'C9300-48P, C9300-48P'
+      platform_id = (device.get('platformId') or '').split(',')[0].strip()
+      if 'platform' in group_by and platform_id:
+        self.add_device_to_group(self.group_name('platform', platform_id), hostname)
+
+      # keyed_groups, groups and compose of constructed
+      hostvars = self.inventory.get_host(hostname).get_vars()
+      self._set_composite_vars(self.get_option('compose'), hostvars, hostname, strict=strict)
+      self._add_host_to_composed_groups(self.get_option('groups'), hostvars, hostname, strict=strict)
+      self._add_host_to_keyed_groups(self.get_option('keyed_groups'), hostvars, hostname, strict=strict)
+
+    # sort by depth so that the parent group is created first
+    sites = data.get('sites') or {}
+    for hierarchy in sorted(sites, key=lambda h: h.count('/')):
+      group_name = self.group_name('site', hierarchy)
+      self.inventory.add_group(group_name)
+
+      if '/' in hierarchy:
+        parent_name = self.group_name('site', hierarchy.rsplit('/', 1)[0])
+        self.inventory.add_group(parent_name)
+        self.inventory.add_child(parent_name, group_name)
+
+      for device_id in sites.get(hierarchy) or []:
+        hostname = hostnames.get(device_id)
+        if hostname:
+          self.inventory.add_child(group_name, hostname)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+
+# (c) Takamitsu IIDA (@takamitsu-iida)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+author: Takamitsu IIDA (@takamitsu-iida)
+lookup: device
+short_description: Resolve network devices of Cisco DNA Center
+description:
+  - Get device objects by id, ip, serial or hostname.
+  - All devices are pulled once into the device index, and keys are resolved locally.
+    Keys not in the index are queried in bulk, many values per request.
+  - Resolved keys are remembered while the process lives, so loops in templates do not send requests per item.
+    Keys not found are remembered too, only when the query succeeded.
+  - Fails if the token cannot be taken or the query fails.
+  - Connection parameters are taken from the arguments, or from the variables of the host such as ansible_host and ansible_user.
+version_added: "2.9"
+options:
+  _terms:
+    description: values of the key
+  key:
+    description: key of the terms
+    default: ip
+    choices: ['id', 'ip', 'serial', 'hostname']
+  id:
+    description: device id or list of them
+  ip:
+    description: management ip address or list of them
+  serial:
+    description: serial number or list of them, any member of switch stacks matches
+  hostname:
+    description: hostname or list of them
+'''
+
+EXAMPLES = '''
+- debug:
+    msg: "{{ lookup('iida.dnac.device', ip='10.10.20.81') }}"
+
+- debug:
+    msg: "{{ item.hostname }} {{ item.id }}"
+  loop: "{{ query('iida.dnac.device', serial=serial_numbers) }}"
+'''
+
+RETURN = '''
+_list:
+  description: device objects in order of the keys, null if not found
+  type: list
+'''
+
+from ansible.errors import AnsibleError
+
+# import from collection
+from ansible_collections.iida.dnac.plugins.lookup.dna import DnaLookupBase
+from ansible_collections.iida.dnac.plugins.module_utils.dnac_devices import DnacDevices
+
+
+class LookupModule(DnaLookupBase):
+
+  KEYS = ('id', 'ip', 'serial', 'hostname')
+
+  def run(self, terms, variables=None, **kwargs):
+
+    # (key, value) to be resolved in order
+    wanted = []
+
+    key = kwargs.pop('key', 'ip')
+    if key not in self.KEYS:
+      raise AnsibleError('key must be one of {}'.format(', '.join(self.KEYS)))
+    wanted.extend((key, value) for value in terms or [])
+
+    for key in self.KEYS:
+      wanted.extend((key, value) for value in self.to_list(kwargs.pop(key, None)))
+
+    drc, memo = self.get_client(DnacDevices, variables, kwargs)
+
+    for key in self.KEYS:
+      missing = list(set(value for k, value in wanted if k == key and (k, value) not in memo))
+      if not missing:
+        continue
+      # a template loop calls the lookup per item, so pull all devices once
+      # instead of leaving it to get_devices_by() which builds the index only for many values,
+      # the index is kept on the client and not pulled again while it is fresh
+      drc.device_index()
+      # None means the query failed, nothing is remembered then
+      devices = drc.get_devices_by(key, missing)
+      if devices is None:
+        raise AnsibleError('failed to query devices by {} on {}'.format(key, drc.host()))
+      for value, device in devices.items():
+        memo[(key, value)] = device
+
+    return [memo.get(item) for item in wanted]
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+
+# (c) Takamitsu IIDA (@takamitsu-iida)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+
+from ansible.errors import AnsibleError
+from ansible.plugins.lookup import LookupBase
+
+# clients and memo tables kept while the process lives
+# key: (pid, class name, host, port, username)
+_CLIENTS = {}
+_MEMOS = {}
+
+
+class DnaLookupBase(LookupBase):
+
+  # lookup argument -> variables used if the argument is not given
+  CONNECTION_VARS = {
+    'host': ('ansible_host', 'remote_addr'),
+    'port': ('ansible_port', 'port'),
+    'username': ('ansible_user', 'remote_user'),
+    'password': ('ansible_password', 'ansible_ssh_pass', 'password'),
+    'timeout': ('timeout',),
+    'http_proxy': ('http_proxy',),
+    'log_dir': ('log_dir',),
+    'workers': (),
+    'device_index_ttl': ()
+  }
+
+
+  def get_connection_params(self, variables, kwargs):
+    """build params of the client from lookup arguments and variables
+
+    Arguments:
+        variables {dict} -- variables of the task
+        kwargs {dict} -- lookup arguments, connection arguments are removed
+
+    Returns:
+        dict -- params
+    """
+    params = {}
+    for name, var_names in self.CONNECTION_VARS.items():
+      value = kwargs.pop(name, None)
+      if value is None:
+        for var_name in var_names:
+          if variables.get(var_name) is not None:
+            value = self._templar.template(variables.get(var_name))
+            break
+      if value is not None:
+        params[name] = value
+
+    if not params.get('host'):
+      raise AnsibleError('host is not specified')
+
+    if not params.get('log_dir'):
+      params['log_dir'] = os.path.join(self._loader.get_basedir(), 'log')
+
+    return params
+
+
+  def get_client(self, client_class, variables, kwargs):
+    """get client object from the registry of this process
+
+    The client keeps the token, the session and the index of devices or groups,
+    so that following lookups in the template loop are resolved without request.
+
+    Arguments:
+        client_class {class} -- DnacRestClient or its subclass
+        variables {dict} -- variables of the task
+        kwargs {dict} -- lookup arguments, connection arguments are removed
+
+    Returns:
+        tuple -- client object and its memo table
+    """
+    params = self.get_connection_params(variables or {}, kwargs)
+    key = (os.getpid(), client_class.__name__, params.get('host'), params.get('port'), params.get('username'))
+
+    drc = _CLIENTS.get(key)
+    if drc is None:
+      drc = client_class(params)
+      _CLIENTS[key] = drc
+      _MEMOS[key] = {}
+
+    return drc, _MEMOS[key]
+
+
+  @staticmethod
+  def to_list(value):
+    """lookup argument as list"""
+    if value is None:
+      return []
+    if isinstance(value, (list, tuple)):
+      return list(value)
+    return [value]
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-docstring
+
+# (c) Takamitsu IIDA (@takamitsu-iida)
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+DOCUMENTATION = '''
+---
+author: Takamitsu IIDA (@takamitsu-iida)
+lookup: group
+short_description: Resolve groups (sites) of Cisco DNA Center
+description:
+  - Get group objects by name, groupNameHierarchy or id.
+  - All groups are pulled once into the group index, and keys are resolved locally.
+  - The index is kept while the process lives, so loops in templates do not send requests per item.
+  - Connection parameters are taken from the arguments, or from the variables of the host such as ansible_host and ansible_user.
+version_added: "2.9"
+options:
+  _terms:
+    description: values of the key
+  key:
+    description: key of the terms
+    default: name
+    choices: ['name', 'hierarchy', 'id']
+  name:
+    description: group name or list of them, the first group is returned if the name is not unique
+  hierarchy:
+    description: groupNameHierarchy or list of them, ex Global/Area1/Building1
+  id:
+    description: group id or list of them
+'''
+
+EXAMPLES = '''
+- debug:
+    msg: "{{ lookup('iida.dnac.group', name='Building1').id }}"
+
+- debug:
+    msg: "{{ query('iida.dnac.group', hierarchy=['Global/Area1', 'Global/Area2']) | map(attribute='id') | list }}"
+'''
+
+RETURN = '''
+_list:
+  description: group objects in order of the keys, null if not found
+  type: list
+'''
+
+from ansible.errors import AnsibleError
+
+# import from collection
+from ansible_collections.iida.dnac.plugins.lookup.dna import DnaLookupBase
+from ansible_collections.iida.dnac.plugins.module_utils.dnac_group import DnacGroup
+
+
+class LookupModule(DnaLookupBase):
+
+  KEYS = ('name', 'hierarchy', 'id')
+
+  def run(self, terms, variables=None, **kwargs):
+
+    # (key, value) to be resolved in order
+    wanted = []
+
+    key = kwargs.pop('key', 'name')
+    if key not in self.KEYS:
+      raise AnsibleError('key must be one of {}'.format(', '.join(self.KEYS)))
+    wanted.extend((key, value) for value in terms or [])
+
+    for key in self.KEYS:
+      wanted.extend((key, value) for value in self.to_list(kwargs.pop(key, None)))
+
+    drc, _ = self.get_client(DnacGroup, variables, kwargs)
+
+    # the index is built by single /api/v1/group request and kept in drc
+    index = drc.group_index()
+    if index is None:
+      raise AnsibleError('failed to get group list')
+
+    lookups = {
+      'name': index.get_by_name,
+      'hierarchy': index.by_hierarchy.get,
+      'id': index.by_id.get
+    }
+    return [lookups[key](value) for key, value in wanted]
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Cisco DNA-C REST API Client with asyncio.
+
+  issue many GET concurrently in a single process
+
+  Used by DnacRestClient.get_many() when aiohttp is installed,
+  otherwise get_many() falls back to threads.
+
+  Requirements:
+    - aiohttp (optional)
+
+"""
+
+import asyncio
+import json
+import logging
+
+try:
+  # https://pypi.org/project/aiohttp/
+  import aiohttp
+  HAS_AIOHTTP = True
+except ImportError:
+  HAS_AIOHTTP = False
+
+logger = logging.getLogger(__name__)
+
+
+class DnacAsyncGetter:
+  """Send GET of DnacRestClient with asyncio
+
+  Token handling, backoff and rate limiter are shared with the client,
+  and the result of GET has the same keys as set_token() decorator.
+  The number of concurrent requests is limited by max_inflight.
+  """
+  # pylint: disable=protected-access
+
+  def __init__(self, drc):
+    """constructor for DnacAsyncGetter class
+
+    Arguments:
+        drc {DnacRestClient} -- client object
+    """
+    self.drc = drc
+
+
+  def get_many(self, api_paths):
+    """GET many api paths concurrently
+
+      results = DnacAsyncGetter(drc).get_many([
+        '/dna/intent/api/v1/interface/network-device/{}'.format(device_id),
+        ('/dna/intent/api/v1/network-device', {'family': 'Switches and Hubs'}),
+      ])
+
+    Arguments:
+        api_paths {list} -- list of api_path or tuple of (api_path, params)
+
+    Returns:
+        list -- list of result in the same order as api_paths
+    """
+    return asyncio.run(self.aget_many(api_paths))
+
+
+  async def aget_many(self, api_paths):
+    """coroutine of get_many()
+
+    Arguments:
+        api_paths {list} -- list of api_path or tuple of (api_path, params)
+
+    Returns:
+        list -- list of result
+    """
+    drc = self.drc
+    loop = asyncio.get_running_loop()
+
+    # token is taken synchronously, it is usually on memory or disk cache
+    token = await loop.run_in_executor(None, drc.get_token)
+    if not token:
+      msg = "failed to get token to access rest api"
+      logging.error(msg)
+      return [{'failed': True, 'status_code': -1, 'msg': msg} for _ in api_paths]
+
+    semaphore = asyncio.BoundedSemaphore(drc._max_inflight)
+    connector = aiohttp.TCPConnector(limit=drc._max_inflight, ssl=False, force_close=not drc._keepalive)
+    timeout = aiohttp.ClientTimeout(total=drc._timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+      context = {'token': token}
+      coroutines = [self.aget(session, semaphore, context, *drc.split_request(item)) for item in api_paths]
+      return await asyncio.gather(*coroutines)
+
+
+  async def aget(self, session, semaphore, context, api_path, params=None):
+    """GET single api path
+
+    Arguments:
+        session {aiohttp.ClientSession} -- session
+        semaphore {asyncio.BoundedSemaphore} -- limit of concurrent requests
+        context {dict} -- shared state, 'token' is replaced after 401
+        api_path {str} -- api path
+
+    Keyword Arguments:
+        params {dict or list} -- query parameters (default: {None})
+
+    Returns:
+        dict -- result, same keys as set_token() decorator
+    """
+    drc = self.drc
+    result = {
+      'failed': True,
+      'status_code': -1
+    }
+
+    if not api_path:
+      result['msg'] = 'api_path is empty'
+      return result
+
+    url = 'https://{}:{}/{}'.format(drc._host, drc._port, drc._normalize_api_path(api_path))
+    proxy = drc._proxies.get('https') if drc._proxies else None
+    loop = asyncio.get_running_loop()
+
+    replayed = False
+    attempt = 0
+    while True:
+      headers = {
+        'Accept': "application/json",
+        'Content-Type': "application/json",
+        'x-auth-token': context['token']
+      }
+
+      if drc._rate_limiter is not None:
+        drc._request_stats['rate_limit_wait'] += await loop.run_in_executor(None, drc._rate_limiter.acquire)
+
+      logging.info("GET %s", url)
+      try:
+        async with semaphore:
+          async with session.get(url, params=params, headers=headers, proxy=proxy) as r:
+            status_code = r.status
+            retry_after = r.headers.get('Retry-After')
+            content_type = r.headers.get('Content-Type', '')
+            text = await r.text()
+      except asyncio.TimeoutError as e:
+        result['msg'] = "asyncio.TimeoutError occured"
+        result['original_message'] = str(e)
+        return result
+      except aiohttp.ClientError as e:
+        result['msg'] = "aiohttp.ClientError occured"
+        result['original_message'] = str(e)
+        return result
+
+      logging.info("%s %s", status_code, url)
+
+      if status_code in drc.RETRY_STATUS_CODES and attempt < drc._backoff_retries:
+        delay = drc.backoff_delay(attempt, retry_after)
+        drc._request_stats['retries'] += 1
+        drc._request_stats['retry_wait'] += delay
+        await asyncio.sleep(delay)
+        attempt += 1
+        continue
+
+      if status_code == 401 and not replayed:
+        stale_token = context['token']
+        new_token = await loop.run_in_executor(None, drc.refresh_token, stale_token)
+        if new_token:
+          # other coroutines use the new token too
+          context['token'] = new_token
+          drc._request_stats['replays'] += 1
+          replayed = True
+          continue
+
+      break
+
+    result['status_code'] = status_code
+    if content_type.find("json") >= 0:
+      try:
+        result['data'] = json.loads(text)
+      except ValueError:
+        result['text'] = text
+    else:
+      result['text'] = text
+
+    if 200 <= status_code < 400:
+      result['failed'] = False
+    elif status_code == 401:
+      drc.save_token(None)
+      result['msg'] = "cached token is removed due to authentication error"
+
+    return result
+
+
+
+if __name__ == '__main__':
+
+  import sys
+
+  from dnac_devices import DnacDevices
+  from dnac_sandbox import sandbox_params
+
+  def main():
+    """main function for test"""
+
+    logging.basicConfig(level=logging.INFO)
+
+    params = sandbox_params.get('always-on-lab')
+
+    drc = DnacDevices(params)
+
+    device_list = drc.get_device_list()
+    if not device_list:
+      sys.exit("no device found.")
+
+    api_paths = ['/dna/intent/api/v1/interface/network-device/{}'.format(device.get('id')) for device in device_list]
+    results = DnacAsyncGetter(drc).get_many(api_paths)
+    for device, get_result in zip(device_list, results):
+      intf_list = drc.extract_data_response(get_result) or []
+      print(device.get('hostname'), len(intf_list))
+
+    return 0
+
+
+  sys.exit(main())
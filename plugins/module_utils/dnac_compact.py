@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Column oriented table of records.
+
+  A device or host object from DNA Center has dozens of keys,
+  and a dict per record costs a lot of memory when there are tens of thousands of them.
+  CompactTable keeps only the selected columns, one list per column.
+
+    table = CompactTable(['id', 'hostIp', 'vlanId'])
+    table.extend(host_list_or_pager)
+
+    for row in table:
+      row.get('hostIp')   # same as dict.get()
+
+    table.to_list()       # list of dict, only when needed
+
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CompactRow:
+  """Read only view of a row in CompactTable
+
+  It has .get() and [] like dict, so show helpers accept it as it is.
+  """
+
+  __slots__ = ('_table', '_index')
+
+  def __init__(self, table, index):
+    self._table = table
+    self._index = index
+
+
+  def get(self, key, default=None):
+    """same as dict.get()"""
+    column = self._table.column(key)
+    if column is None:
+      return default
+    return column[self._index]
+
+
+  def __getitem__(self, key):
+    column = self._table.column(key)
+    if column is None:
+      raise KeyError(key)
+    return column[self._index]
+
+
+  def __contains__(self, key):
+    return self._table.column(key) is not None
+
+
+  def keys(self):
+    """column names"""
+    return list(self._table.columns)
+
+
+  def to_dict(self):
+    """convert to dict
+
+    Returns:
+        dict -- record
+    """
+    return {name: self._table.column(name)[self._index] for name in self._table.columns}
+
+
+
+class CompactTable:
+  """Records stored column by column
+  """
+
+  def __init__(self, columns):
+    """constructor for CompactTable class
+
+    Arguments:
+        columns {list} -- keys of the record to be kept
+    """
+    self.columns = tuple(columns)
+    self._data = {name: [] for name in self.columns}
+    self._length = 0
+
+
+  def column(self, name):
+    """list of values of the column, None if not a column"""
+    return self._data.get(name)
+
+
+  def append(self, record):
+    """Add a record, keys other than columns are dropped.
+
+    Arguments:
+        record {dict} -- record
+    """
+    for name in self.columns:
+      self._data[name].append(record.get(name))
+    self._length += 1
+
+
+  def extend(self, records):
+    """Add records one by one, iterable such as DnacPager is consumed lazily.
+
+    Arguments:
+        records {iterable} -- records
+    """
+    for record in records:
+      self.append(record)
+
+
+  def __len__(self):
+    return self._length
+
+
+  def __bool__(self):
+    return self._length > 0
+
+
+  def __iter__(self):
+    for index in range(self._length):
+      yield CompactRow(self, index)
+
+
+  def __getitem__(self, index):
+    if index < 0:
+      index += self._length
+    if not 0 <= index < self._length:
+      raise IndexError(index)
+    return CompactRow(self, index)
+
+
+  def to_dicts(self):
+    """Yield records as dict one by one."""
+    for row in self:
+      yield row.to_dict()
+
+
+  def to_list(self):
+    """list of records as dict"""
+    return list(self.to_dicts())
+
+
+  def to_columns(self):
+    """Compact form for json
+
+    {
+      "columns": ["id", "hostname"],
+      "rows": [["id1", "sw1"], ["id2", "sw2"]]
+    }
+
+    Returns:
+        dict -- columns and rows
+    """
+    return {
+      'columns': list(self.columns),
+      'rows': [list(values) for values in zip(*(self._data[name] for name in self.columns))]
+    }
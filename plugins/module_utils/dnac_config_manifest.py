@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Manifest of saved device configs.
+
+  dest/manifest.json
+
+  {
+    "device_id": {
+      "sha256": "9c36ee0a4a...",
+      "size": 12345,
+      "timestamp": 1578900000.123,
+      "path": "/path/to/dest/device_id.cfg"
+    }
+  }
+
+  timestamp is the time when the config was written, that is, when it changed last.
+
+"""
+
+import json
+import logging
+
+try:
+  from dnac_file_util import atomic_write
+except ImportError:
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_file_util import atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class DnacConfigManifest:
+  """Content hash of config per device id
+  """
+
+  def __init__(self, path):
+    """constructor for DnacConfigManifest class
+
+    Arguments:
+        path {str} -- path of the manifest file
+    """
+    self.path = path
+    self.entries = self.load()
+    self.dirty = False
+
+
+  def load(self):
+    """Load entries.
+
+    Returns:
+        dict -- entries, empty if not found
+    """
+    try:
+      with open(self.path, encoding='UTF-8') as f:
+        data = json.load(f)
+    except FileNotFoundError:
+      return {}
+    except (IOError, ValueError) as e:
+      logging.exception(e)
+      return {}
+
+    if not isinstance(data, dict):
+      return {}
+    return data
+
+
+  def get(self, device_id):
+    """Get entry of the device.
+
+    Arguments:
+        device_id {str} -- device id
+
+    Returns:
+        dict or None -- entry
+    """
+    return self.entries.get(device_id)
+
+
+  def put(self, device_id, entry):
+    """Replace entry of the device, the file is written by write().
+
+    Arguments:
+        device_id {str} -- device id
+        entry {dict} -- sha256, size, timestamp and path
+    """
+    self.entries[device_id] = entry
+    self.dirty = True
+
+
+  def write(self):
+    """Write entries to temporary file and rename it, only if changed."""
+    if not self.dirty:
+      return
+
+    try:
+      atomic_write(self.path, json.dumps(self.entries, indent=2, sort_keys=True))
+    except (IOError, OSError) as e:
+      logging.exception(e)
+      return
+
+    self.dirty = False
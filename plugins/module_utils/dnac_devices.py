@@ -2,50 +2,391 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=missing-module-docstring
 
+import concurrent.futures
+import hashlib
+import json
 import logging
+import os
+import time
 
 try:
-  # https://pypi.org/project/tabulate/
-  HAS_TABULATE = True
-  import tabulate
+  from dnac_rest_client import DnacRestClient, load_requests
 except ImportError:
-  HAS_TABULATE = False
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_rest_client import DnacRestClient, load_requests
 
 try:
-  from dnac_rest_client import DnacRestClient
+  from dnac_compact import CompactTable
 except ImportError:
-  from ansible_collections.iida.dnac.plugins.module_utils.dnac_rest_client import DnacRestClient
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_compact import CompactTable
+
+try:
+  from dnac_config_manifest import DnacConfigManifest
+except ImportError:
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_config_manifest import DnacConfigManifest
+
+try:
+  from dnac_json_stream import DnacJsonStream
+except ImportError:
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_json_stream import DnacJsonStream
+
+try:
+  from dnac_file_util import atomic_write, safe_name
+except ImportError:
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_file_util import atomic_write, safe_name
 
 logger = logging.getLogger(__name__)
 
 
+class DeviceIndex:
+  """Index of devices for O(1) lookup
+
+    by_id         id -> device
+    by_ip         managementIpAddress -> device
+    by_serial     serialNumber -> device, each member of switch stacks is indexed
+    by_hostname   hostname -> device
+  """
+
+  def __init__(self, device_list, built=None):
+    """constructor for DeviceIndex class
+
+    Arguments:
+        device_list {list} -- list of device object from /dna/intent/api/v1/network-device
+
+    Keyword Arguments:
+        built {float} -- epoch time when the device list was taken (default: {now})
+    """
+    self.built = built or time.time()
+    self.devices = []
+    self.by_id = {}
+    self.by_ip = {}
+    self.by_serial = {}
+    self.by_hostname = {}
+
+    for device in device_list or []:
+      self.add(device)
+
+
+  def add(self, device):
+    """add device to the index
+
+    Arguments:
+        device {dict} -- device object
+    """
+    if not isinstance(device, dict):
+      return
+
+    device_id = device.get('id')
+    if device_id in self.by_id:
+      self.devices = [d for d in self.devices if d.get('id') != device_id]
+    self.devices.append(device)
+
+    if device_id:
+      self.by_id[device_id] = device
+    if device.get('managementIpAddress'):
+      self.by_ip[device.get('managementIpAddress')] = device
+    if device.get('hostname'):
+      self.by_hostname[device.get('hostname')] = device
+
+    # in case of switch stacks, 'FOC1234X0AB, FOC1234X0CD'
+    for serial_number in (device.get('serialNumber') or '').split(','):
+      serial_number = serial_number.strip()
+      if serial_number:
+        self.by_serial[serial_number] = device
+
+
+  def is_fresh(self, ttl):
+    """return True if the index is younger than ttl seconds"""
+    return self.built + ttl > time.time()
+
+
+  def get_by_id(self, device_id):
+    """get device by id"""
+    return self.by_id.get(device_id)
+
+
+  def get_by_ip(self, ip):
+    """get device by management ip address"""
+    return self.by_ip.get(ip)
+
+
+  def get_by_serial(self, serial_number):
+    """get device by serial number, any member of the stack matches"""
+    return self.by_serial.get(serial_number)
+
+
+  def get_by_hostname(self, hostname):
+    """get device by hostname"""
+    return self.by_hostname.get(hostname)
+
+
+  @classmethod
+  def load(cls, path):
+    """Load index from json file.
+
+    Arguments:
+        path {str} -- path of the file
+
+    Returns:
+        DeviceIndex or None -- index, None if not found
+    """
+    try:
+      with open(path, encoding='UTF-8') as f:
+        data = json.load(f)
+    except FileNotFoundError:
+      return None
+    except (IOError, ValueError) as e:
+      logging.exception(e)
+      return None
+
+    if not isinstance(data, dict) or not isinstance(data.get('devices'), list):
+      return None
+    return cls(data.get('devices'), built=data.get('built'))
+
+
+  def save(self, path):
+    """Write index to temporary file and rename it.
+
+    Arguments:
+        path {str} -- path of the file
+    """
+    try:
+      atomic_write(path, json.dumps({'built': self.built, 'devices': self.devices}))
+    except (IOError, OSError) as e:
+      logging.exception(e)
+
+
+
 class DnacDevices(DnacRestClient):
   """Manage Network Devices"""
 
-  def get_device_list(self):
+  # api path of per-device details, used by collect_device_details()
+  DEVICE_DETAIL_PATHS = {
+    'device': '/dna/intent/api/v1/network-device/{}',
+    'interfaces': '/dna/intent/api/v1/interface/network-device/{}',
+    'licenses': '/api/v1/license-info/network-device/{}',
+    'config': '/dna/intent/api/v1/network-device/{}/config'
+  }
+
+  # read size of streamed response
+  DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
+
+  # lifetime of the device index in sec, 0 disables the index
+  DEFAULT_DEVICE_INDEX_TTL = 300
+
+  # query parameter of /dna/intent/api/v1/network-device for get_devices_by()
+  DEVICE_FILTER_KEYS = {
+    'id': 'id',
+    'ip': 'managementIpAddress',
+    'serial': 'serialNumber',
+    'hostname': 'hostname'
+  }
+
+  # number of values in a single filtered request, keeps the url short
+  MAX_FILTER_VALUES = 40
+
+  # columns of compact device list, used by show_device_list()
+  DEVICE_COLUMNS = [
+    'id',
+    'hostname',
+    'managementIpAddress',
+    'serialNumber',
+    'platformId',
+    'softwareVersion',
+    'role',
+    'upTime'
+  ]
+
+  # module argument -> query parameter of /dna/intent/api/v1/network-device
+  DEVICE_QUERY_PARAMS = {
+    'hostname': 'hostname',
+    'family': 'family',
+    'type': 'type',
+    'series': 'series',
+    'role': 'role',
+    'platform_id': 'platformId',
+    'software_type': 'softwareType',
+    'software_version': 'softwareVersion',
+    'reachability_status': 'reachabilityStatus',
+    'location_name': 'locationName'
+  }
+
+
+  # argument of the modules, used by the module and by the action plugin running on the controller
+  get_devices_argument_spec = dict(
+    DnacRestClient.argument_spec,
+    ip=dict(type='list'),
+    id=dict(type='list'),
+    serial=dict(type='list'),
+    details=dict(type='list'),
+    hostname=dict(type='list'),
+    family=dict(type='list'),
+    type=dict(type='list'),
+    series=dict(type='list'),
+    role=dict(type='list'),
+    platform_id=dict(type='list'),
+    software_type=dict(type='list'),
+    software_version=dict(type='list'),
+    reachability_status=dict(type='list'),
+    location_name=dict(type='list'),
+    fields=dict(type='list'),
+    compact=dict(default=False, type='bool'))
+
+  device_config_argument_spec = dict(
+    DnacRestClient.argument_spec,
+    dest=dict(type='path'))
+
+
+  def __init__(self, params):
+    super().__init__(params)
+
+    # DeviceIndex built from one device list pull, shared by processes through the file
+    device_index_ttl = params.get('device_index_ttl')
+    self._device_index_ttl = self.DEFAULT_DEVICE_INDEX_TTL if device_index_ttl is None else device_index_ttl
+    self.device_index_path = os.path.join(self.log_dir, "dnac_devices.{}.json".format(safe_name(self._host)))
+    self._device_index = None
+
+
+  def device_index(self, build=True):
+    """get index of all devices
+
+    The index in memory or in device_index_path is used if it is younger than device_index_ttl,
+    otherwise it is rebuilt from the device list.
+
+    Keyword Arguments:
+        build {bool} -- rebuild if no fresh index, pulling all devices is too much for a single lookup (default: {True})
+
+    Returns:
+        DeviceIndex or None -- index, None if disabled, not built or failed to get device list
+    """
+    if self._device_index_ttl <= 0:
+      return None
+
+    if self._device_index is not None and self._device_index.is_fresh(self._device_index_ttl):
+      return self._device_index
+
+    index = DeviceIndex.load(self.device_index_path)
+    if index is None or not index.is_fresh(self._device_index_ttl):
+      if not build:
+        return None
+      device_list = self.get_device_list()
+      if device_list is None:
+        return None
+      index = DeviceIndex(device_list)
+      index.save(self.device_index_path)
+
+    self._device_index = index
+    return index
+
+
+  def invalidate_device_index(self):
+    """discard index, it will be rebuilt on next lookup"""
+    self._device_index = None
+    try:
+      os.remove(self.device_index_path)
+    except OSError:
+      pass
+
+
+  def remember_devices(self, device_list):
+    """add devices found by api to the index, the file is written once
+
+    Arguments:
+        device_list {list} -- list of device object
+    """
+    device_list = [device for device in device_list or [] if isinstance(device, dict)]
+    if self._device_index is None or not device_list:
+      return
+    for device in device_list:
+      self._device_index.add(device)
+    self._device_index.save(self.device_index_path)
+
+
+  def device_detail_path(self, device_id, field):
+    """Get api path of the detail
+
+    Arguments:
+        device_id {str} -- device id
+        field {str} -- key of DEVICE_DETAIL_PATHS or 'interface:{name}'
+
+    Returns:
+        str -- api path, None if field is unknown
+    """
+    if field.startswith('interface:'):
+      name = field[len('interface:'):]
+      return '/dna/intent/api/v1/interface/network-device/{}/interface-name?name={}'.format(device_id, name)
+    api_path = self.DEVICE_DETAIL_PATHS.get(field)
+    if api_path is None:
+      return None
+    return api_path.format(device_id)
+
+  def iter_device_list(self, filters=None, fields=None):
+    """Iterate over all devices page by page
+
+    version 1.2
+    /dna/intent/api/v1/network-device?offset={offset}&limit={limit}
+
+    Keyword Arguments:
+        filters {dict or list} -- query parameters, ex {'family': 'Switches and Hubs'} (default: {None})
+        fields {list} -- keys to be kept in each device (default: {None})
+
+    Returns:
+        DnacPager -- iterable object of device
+    """
+    api_path = '/dna/intent/api/v1/network-device'
+    return self.paginate(api_path, params=filters, fields=fields)
+
+
+  def get_device_list(self, filters=None, fields=None, compact=False):
     """Get device list
 
     version 1.2
-    /dna/intent/api/v1/network-device
+    /dna/intent/api/v1/network-device/count
+    /dna/intent/api/v1/network-device?offset={offset}&limit={limit}
+
+    The count does not reflect filters, so filtered list is fetched serially.
+
+    Keyword Arguments:
+        filters {dict or list} -- query parameters, ex {'family': 'Switches and Hubs'} (default: {None})
+        fields {list} -- keys to be kept in each device (default: {None})
+        compact {bool} -- return CompactTable of fields or DEVICE_COLUMNS (default: {False})
 
     Returns:
-        [type] -- [description]
+        list or CompactTable -- List of all devices, None if failed
     """
     api_path = '/dna/intent/api/v1/network-device'
-    get_result = self.get(api_path=api_path)
-    return self.extract_data_response(get_result)
+    count_path = None if filters else '/dna/intent/api/v1/network-device/count'
+    into = CompactTable(['id'] + [f for f in fields if f != 'id'] if fields else self.DEVICE_COLUMNS) if compact else None
+    return self.fetch_pages(api_path, params=filters, count_path=count_path, fields=fields, into=into)
+
+
+  def device_filters(self):
+    """Build query parameters from module arguments in DEVICE_QUERY_PARAMS
+
+    Returns:
+        list -- list of (name, value), multiple values are repeated
+    """
+    filters = []
+    for arg, name in self.DEVICE_QUERY_PARAMS.items():
+      values = self.params.get(arg)
+      if values is None:
+        continue
+      if not isinstance(values, list):
+        values = [values]
+      filters.extend((name, value) for value in values)
+    return filters
 
 
   def show_device_list(self, device_list=None):
-    """Print devices"""
+    """Print devices
+
+    Keyword Arguments:
+        device_list {list or CompactTable} -- List of device object (default: {None})
+    """
     if device_list is None:
-      device_list = self.get_device_list()
+      device_list = self.get_device_list(compact=True)
       if not device_list:
         print("no device found.")
         return
-    if not HAS_TABULATE:
-      print("tabulate module not found.")
-      return
 
     headers = ['hostname', 'mgmt ip', 'serial', 'platform', 'version', 'role', 'uptime']
     table = []
@@ -70,7 +411,7 @@ class DnacDevices(DnacRestClient):
       for (serial_number, platform_id) in serial_platform_list:
         table.append([hostname, mgmt, serial_number, platform_id, version, role, uptime])
 
-    print(tabulate.tabulate(table, headers, tablefmt='simple'))
+    self.print_table(table, headers)
 
 
   def get_device_by_id(self, device_id=None):
@@ -79,6 +420,7 @@ class DnacDevices(DnacRestClient):
     version 1.2
     /dna/intent/api/v1/network-device/{device_id}
 
+    The device index is consulted first if it is fresh, a single lookup does not build it.
 
     Keyword Arguments:
         device_id {str} -- The identifier of the device (default: {None})
@@ -88,9 +430,16 @@ class DnacDevices(DnacRestClient):
     """
     if device_id is None:
       return None
+
+    index = self.device_index(build=False)
+    if index is not None and index.get_by_id(device_id):
+      return index.get_by_id(device_id)
+
     api_path = '/dna/intent/api/v1/network-device/{}'.format(device_id)
     get_result = self.get(api_path=api_path)
-    return self.extract_data_response(get_result)
+    device = self.extract_data_response(get_result)
+    self.remember_devices([device])
+    return device
 
 
   def get_device_by_ip(self, ip=None):
@@ -99,17 +448,26 @@ class DnacDevices(DnacRestClient):
     version 1.2
     /dna/intent/api/v1/network-device?managementIpAddress={ip}
 
+    The device index is consulted first if it is fresh, a single lookup does not build it.
+
     Keyword Arguments:
-        ip {[type]} -- [description] (default: {None})
+        ip {str} -- IP address of the device (default: {None})
 
     Returns:
-        dict -- Object of the device
+        list -- List of the device
     """
     if ip is None:
       return None
+
+    index = self.device_index(build=False)
+    if index is not None and index.get_by_ip(ip):
+      return [index.get_by_ip(ip)]
+
     api_path = '/dna/intent/api/v1/network-device?managementIpAddress={}'.format(ip)
     get_result = self.get(api_path=api_path)
-    return self.extract_data_response(get_result)
+    device_list = self.extract_data_response(get_result)
+    self.remember_devices(device_list)
+    return device_list
 
 
   def get_device_id_by_ip(self, ip=None):
@@ -124,10 +482,10 @@ class DnacDevices(DnacRestClient):
     Returns:
         str -- The identifier of the device
     """
-    device = self.get_device_by_ip(ip=ip)
-    if not device:
+    device_list = self.get_device_by_ip(ip=ip)
+    if not device_list:
       return None
-    return device.get('id')
+    return device_list[0].get('id')
 
 
   def get_device_by_serial(self, serial_number=None):
@@ -136,17 +494,129 @@ class DnacDevices(DnacRestClient):
     version 1.2
     /dna/intent/api/v1/network-device?serialNumber={}
 
+    The device index is consulted first if it is fresh, a single lookup does not build it.
+    Any member of the switch stack matches.
+
     Keyword Arguments:
         serial_number {str} -- The serial number of the device (default: {None})
 
     Returns:
-        dict -- Object of the device
+        list -- List of the device
     """
     if serial_number is None:
       return None
+
+    index = self.device_index(build=False)
+    if index is not None and index.get_by_serial(serial_number):
+      return [index.get_by_serial(serial_number)]
+
     api_path = '/dna/intent/api/v1/network-device?serialNumber={}'.format(serial_number)
     get_result = self.get(api_path=api_path)
-    return self.extract_data_response(get_result)
+    device_list = self.extract_data_response(get_result)
+    self.remember_devices(device_list)
+    return device_list
+
+
+  def get_device_by_hostname(self, hostname=None):
+    """Get device object by hostname
+
+    version 1.2
+    /dna/intent/api/v1/network-device?hostname={}
+
+    The device index is consulted first if it is fresh, a single lookup does not build it.
+
+    Keyword Arguments:
+        hostname {str} -- The hostname of the device (default: {None})
+
+    Returns:
+        list -- List of the device
+    """
+    if hostname is None:
+      return None
+
+    index = self.device_index(build=False)
+    if index is not None and index.get_by_hostname(hostname):
+      return [index.get_by_hostname(hostname)]
+
+    api_path = '/dna/intent/api/v1/network-device?hostname={}'.format(hostname)
+    get_result = self.get(api_path=api_path)
+    device_list = self.extract_data_response(get_result)
+    self.remember_devices(device_list)
+    return device_list
+
+
+  def get_devices_by(self, key, values):
+    """Get many devices by id, ip, serial or hostname
+
+    Values found in the device index are resolved without request.
+    The index is built only if the values do not fit in a single request, MAX_FILTER_VALUES.
+    The rest are queried by /dna/intent/api/v1/network-device with multiple values,
+    MAX_FILTER_VALUES values per request, and the requests are sent by workers threads.
+
+      managementIpAddress, serialNumber and hostname are repeated
+        ?managementIpAddress=10.0.0.1&managementIpAddress=10.0.0.2
+      id is comma separated
+        ?id=xxx,yyy
+
+    Arguments:
+        key {str} -- one of 'id', 'ip', 'serial', 'hostname'
+        values {list} -- list of values
+
+    Returns:
+        dict -- device object keyed by value, None if not found,
+                or None if failed to query, so that errors are not reported as not found
+    """
+    devices = {value: None for value in values}
+    lookup = 'get_by_' + key
+
+    index = self.device_index(build=len(values) > self.MAX_FILTER_VALUES)
+    if index is not None:
+      for value in values:
+        devices[value] = getattr(index, lookup)(value)
+
+    missing = [value for value, device in devices.items() if device is None]
+    if not missing:
+      return devices
+
+    param_name = self.DEVICE_FILTER_KEYS[key]
+    chunks = [missing[i:i + self.MAX_FILTER_VALUES] for i in range(0, len(missing), self.MAX_FILTER_VALUES)]
+
+    def _get(chunk):
+      if key == 'id':
+        params = [(param_name, ','.join(chunk))]
+      else:
+        params = [(param_name, value) for value in chunk]
+      get_result = self.get(api_path='/dna/intent/api/v1/network-device', params=params)
+      if not get_result or get_result.get('failed'):
+        return None
+      return self.extract_data_response(get_result) or []
+
+    # get token in advance, workers share it
+    if not self.get_token():
+      logging.error('failed to get token to query devices by %s', key)
+      return None
+
+    workers = max(min(self._workers, len(chunks)), 1)
+    found = DeviceIndex([])
+    failed = False
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+      for device_list in executor.map(_get, chunks):
+        if device_list is None:
+          failed = True
+          continue
+        for device in device_list:
+          found.add(device)
+
+    if failed:
+      logging.error('failed to query devices by %s', key)
+      return None
+
+    self.remember_devices(found.devices)
+
+    for value in missing:
+      devices[value] = getattr(found, lookup)(value)
+
+    return devices
 
 
   def show_device(self, device):
@@ -162,10 +632,6 @@ class DnacDevices(DnacRestClient):
       print('no device information found.')
       return
 
-    if not HAS_TABULATE:
-      print("tabulate module not found.")
-      return
-
     # print(json.dumps(device, ensure_ascii=False, indent=2))
 
     def get_row(key):
@@ -190,7 +656,7 @@ class DnacDevices(DnacRestClient):
     for key in want_keys:
       table.append(get_row(key))
 
-    print(tabulate.tabulate(table))
+    self.print_table(table)
 
 
   def get_device_licenses(self, device_id=None):
@@ -222,10 +688,6 @@ class DnacDevices(DnacRestClient):
       print('no license information found.')
       return
 
-    if not HAS_TABULATE:
-      print("tabulate module not found.")
-      return
-
     headers = ['name', 'status', 'type', 'maxUsageCount', 'usageCountRemaining']
     table = []
     for lic in license_list:
@@ -236,7 +698,7 @@ class DnacDevices(DnacRestClient):
       usage_count_remaining = lic.get('usageCountRemaining') or '-'
       table.append([license_name, status, license_type, max_usage_count, usage_count_remaining])
 
-    print(tabulate.tabulate(table, headers, tablefmt='simple'))
+    self.print_table(table, headers)
 
 
   def get_device_config(self):
@@ -246,6 +708,116 @@ class DnacDevices(DnacRestClient):
     return self.extract_data_response(get_result)
 
 
+  def save_device_config(self, dest=None, check_mode=False):
+    """Save running config of all devices to files
+
+    The response of /dna/intent/api/v1/network-device/config is streamed,
+    and each runningConfig is written to {dest}/{device_id}.cfg as soon as it is parsed,
+    so the memory usage is bounded by the largest config.
+
+    sha256 of the config is compared with {dest}/manifest.json,
+    and only changed configs are written.
+
+    [
+      {
+        "id": "device_id",
+        "path": "/path/to/log/config/device_id.cfg",
+        "size": 12345,
+        "sha256": "...",
+        "timestamp": 1578900000.123,
+        "changed": true
+      }
+    ]
+
+    Keyword Arguments:
+        dest {str} -- directory to save configs (default: {log_dir/config})
+        check_mode {bool} -- report changes without writing (default: {False})
+
+    Returns:
+        list -- list of configs, None if failed
+    """
+    dest = dest or os.path.join(self.log_dir, 'config')
+    try:
+      os.makedirs(dest, exist_ok=True)
+    except OSError as e:
+      logging.error("failed to create directory %s: %s", dest, e)
+      return None
+
+    manifest = DnacConfigManifest(os.path.join(dest, 'manifest.json'))
+
+    api_path = '/dna/intent/api/v1/network-device/config'
+    get_result = self.get(api_path=api_path, stream=True)
+    if get_result.get('failed'):
+      logging.error(get_result.get('msg') or 'status code: {}'.format(get_result.get('status_code')))
+      return None
+
+    r = get_result.get('response')
+    config_list = []
+
+    # the body is read while parsing it, so the connection errors are raised in the loop too
+    request_errors = load_requests().exceptions.RequestException
+    try:
+      stream = DnacJsonStream(r.iter_content(chunk_size=self.DEFAULT_STREAM_CHUNK_SIZE))
+      for item in stream.iter_items('response'):
+        if not isinstance(item, dict) or not item.get('id'):
+          continue
+        config_list.append(self.backup_device_config(manifest, dest, item.get('id'), item.get('runningConfig') or '', check_mode))
+    except ValueError as e:
+      logging.error("failed to parse the response of %s: %s", api_path, e)
+      return None
+    except request_errors as e:
+      logging.error("failed to read the response of %s: %s", api_path, e)
+      return None
+    except OSError as e:
+      logging.error("failed to write config to %s: %s", dest, e)
+      return None
+    finally:
+      r.close()
+      # keep hashes of the configs already written
+      if not check_mode:
+        manifest.write()
+
+    return config_list
+
+
+  @staticmethod
+  def backup_device_config(manifest, dest, device_id, config, check_mode=False):
+    """Write config to the file only if its hash differs from the manifest
+
+    Arguments:
+        manifest {DnacConfigManifest} -- manifest
+        dest {str} -- directory
+        device_id {str} -- device id, used as file name
+        config {str} -- running config
+
+    Keyword Arguments:
+        check_mode {bool} -- do not write (default: {False})
+
+    Returns:
+        dict -- id, path, size, sha256, timestamp and changed
+    """
+    data = config.encode('UTF-8')
+    digest = hashlib.sha256(data).hexdigest()
+    path = os.path.join(dest, safe_name(device_id) + '.cfg')
+
+    entry = manifest.get(device_id)
+    if entry and entry.get('sha256') == digest and entry.get('path') == path and os.path.exists(path):
+      return dict(entry, id=device_id, changed=False)
+
+    entry = {
+      'path': path,
+      'size': len(data),
+      'sha256': digest,
+      'timestamp': time.time()
+    }
+
+    if not check_mode:
+      atomic_write(path, data)
+      manifest.put(device_id, entry)
+
+    return dict(entry, id=device_id, changed=True)
+
+
   def get_device_interfaces(self, device_id=None):
     """Get device interfaces by device_id
 
@@ -312,10 +884,6 @@ class DnacDevices(DnacRestClient):
       print("no interface found.")
       return
 
-    if not HAS_TABULATE:
-      print("tabulate module not found.")
-      return
-
     # sort by portName
     intf_list = sorted(intf_list, key=lambda port: port.get('portName'))
 
@@ -343,11 +911,72 @@ class DnacDevices(DnacRestClient):
 
       table.append([port_name, speed, status, interface_type, vlan_id, extra])
 
-    print(tabulate.tabulate(table, headers, tablefmt='simple'))
+    self.print_table(table, headers)
     print('')
     print("Total ports:{}, up:{}".format(total_ports, total_up))
 
 
+  def collect_device_details(self, device_ids=None, fields=None):
+    """Get details of many devices concurrently
+
+    Per-device GETs are issued concurrently by get_many(), with asyncio if aiohttp is installed,
+    and failures are recorded in 'errors' of the device without aborting others.
+    The number of concurrent requests is limited by max_inflight, workers does not apply here.
+
+    {
+      "device_id": {
+        "interfaces": [...],
+        "licenses": [...],
+        "errors": {
+          "config": "status code: 404"
+        }
+      }
+    }
+
+    Keyword Arguments:
+        device_ids {list} -- list of device id, all devices if not specified (default: {None})
+        fields {list} -- keys of DEVICE_DETAIL_PATHS or 'interface:{name}' (default: {['interfaces', 'licenses']})
+
+    Returns:
+        dict -- details keyed by device id, None if failed to get device list
+    """
+    if device_ids is None:
+      device_list = self.get_device_list()
+      if device_list is None:
+        return None
+      device_ids = [device.get('id') for device in device_list]
+
+    fields = fields or ['interfaces', 'licenses']
+
+    details = {}
+    jobs = []
+    for device_id in device_ids:
+      details[device_id] = {'errors': {}}
+      for field in fields:
+        api_path = self.device_detail_path(device_id, field)
+        if api_path is None:
+          details[device_id]['errors'][field] = "unknown field {}".format(field)
+          continue
+        jobs.append((device_id, field, api_path))
+
+    if not jobs:
+      return details
+
+    # get token in advance, get_many() shares it
+    if not self.get_token():
+      return None
+
+    logging.info('collecting %s details of %s devices', len(fields), len(device_ids))
+    for (device_id, field, _), get_result in zip(jobs, self.get_many([job[2] for job in jobs])):
+      if not get_result or get_result.get('failed'):
+        get_result = get_result or {}
+        details[device_id]['errors'][field] = get_result.get('msg') or 'status code: {}'.format(get_result.get('status_code'))
+        continue
+      details[device_id][field] = self.extract_data_response(get_result)
+
+    return details
+
+
   def assign_device_to_site(self, site_id, device_list):
     """assign devices to site
 
@@ -401,6 +1030,9 @@ class DnacDevices(DnacRestClient):
     response = self.post(api_path=api_path, data=payload)
     print(json.dumps(response, indent=2))
 
+    # location of the devices in the index is stale now, even if the request failed halfway
+    self.invalidate_device_index()
+
 
   def execute_module_get_devices(self, check_mode=False):
     """execute ansible module
@@ -419,30 +1051,91 @@ class DnacDevices(DnacRestClient):
     if check_mode:
       result['warnings'] = "Get devices operation is not restricted by check_mode"
 
-    device_ip = self.params.get('ip')
-    device_id = self.params.get('id')
-    device_serial = self.params.get('serial')
-
-    device = None
-    device_list = None
-
-    if any([device_ip, device_id, device_serial]):
-      if device_ip:
-        device = self.get_device_by_ip(device_ip)
-      elif device_id:
-        device = self.get_device_by_id(device_id)
-      elif device_serial:
-        device = self.get_device_by_serial(device_serial)
-      if device:
-        result['device_list'] = [device]
-      else:
+    # ip, id and serial accept a single value or a list
+    lookup = None
+    for key in ['ip', 'id', 'serial']:
+      values = self.params.get(key)
+      if values:
+        lookup = (key, [values] if isinstance(values, str) else list(values))
+        break
+
+    fields = self.params.get('fields')
+
+    if lookup:
+      devices = self.get_devices_by(*lookup)
+      if devices is None:
         result['failed'] = True
+        result['msg'] = "failed to query devices by {}".format(lookup[0])
+        device_list = []
+      else:
+        devices = {value: self.project_fields(device, fields) for value, device in devices.items()}
+        result['devices'] = devices
+        result['not_found'] = [value for value, device in devices.items() if device is None]
+        device_list = []
+        seen = set()
+        for device in devices.values():
+          if device and device.get('id') not in seen:
+            seen.add(device.get('id'))
+            device_list.append(device)
+        if device_list:
+          result['device_list'] = device_list
+        else:
+          result['failed'] = True
     else:
-      device_list = self.get_device_list()
-      if device_list:
-        result['device_list'] = device_list
+      filters = self.device_filters()
+      compact = self.params.get('compact')
+      device_list = self.get_device_list(filters=filters, fields=fields, compact=compact)
+      # no match is not an error if filtered
+      if device_list is None or (not device_list and not filters):
+        result['failed'] = True
+      elif compact:
+        result['device_table'] = device_list.to_columns()
       else:
+        result['device_list'] = device_list
+
+    # per-device details
+    details = self.params.get('details')
+    if details and device_list:
+      device_ids = [device.get('id') for device in device_list]
+      device_details = self.collect_device_details(device_ids=device_ids, fields=details)
+      if device_details is None:
         result['failed'] = True
+      else:
+        result['device_details'] = device_details
+
+    result['session_stats'] = self.session_stats()
+    result['request_stats'] = self.request_stats()
+    result['cache_stats'] = self.cache_stats()
+
+    return result
+
+
+  def execute_module_device_config(self, check_mode=False):
+    """execute ansible module
+
+    Keyword Arguments:
+        check_mode {bool} -- Check mode or not (default: {False})
+
+    Returns:
+        dict -- Object of the result
+    """
+    result = {
+      'changed': False,
+      'failed': False
+    }
+
+    config_list = self.save_device_config(dest=self.params.get('dest'), check_mode=check_mode)
+    if config_list is None:
+      result['failed'] = True
+      result['msg'] = "failed to get device config"
+    else:
+      result['config_list'] = config_list
+      result['changed_devices'] = [c.get('id') for c in config_list if c.get('changed')]
+      result['changed'] = bool(result['changed_devices'])
+
+    result['session_stats'] = self.session_stats()
+    result['request_stats'] = self.request_stats()
+    result['cache_stats'] = self.cache_stats()
 
     return result
 
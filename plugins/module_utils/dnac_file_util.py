@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""File helpers shared by token store, response cache, task journal, device index and config backup.
+
+  atomic_write(path, data)
+    data is written to a temporary file in the same directory, flushed to the disk and renamed,
+    so readers always see complete content without lock.
+
+  safe_name(name)
+    host name, ipv6 address or device id as a part of file name.
+
+"""
+
+import os
+import re
+import tempfile
+
+
+def safe_name(name):
+  """Replace characters which are not safe in file name, such as ':' of ipv6 address.
+
+  Arguments:
+      name {str} -- host, device id and so on
+
+  Returns:
+      str -- name which consists of alphanumerics, '.', '_' and '-'
+  """
+  return re.sub(r'[^A-Za-z0-9._-]', '_', name or '')
+
+
+def atomic_write(path, data, mode=None):
+  """Write data to temporary file and rename it to path.
+
+  The temporary file is removed if anything fails, and the error is raised to the caller.
+
+  Arguments:
+      path {str} -- path of the file
+      data {str or bytes} -- content, str is encoded by UTF-8
+
+  Keyword Arguments:
+      mode {int} -- permission of the file, ex 0o600 (default: {None})
+
+  Raises:
+      OSError -- failed to write or rename
+  """
+  dir_name = os.path.dirname(path) or '.'
+  suffix = os.path.splitext(path)[1]
+  fd, tmp_path = tempfile.mkstemp(dir=dir_name, prefix='.tmp-', suffix=suffix)
+  try:
+    with os.fdopen(fd, 'wb') as f:
+      f.write(data.encode('UTF-8') if isinstance(data, str) else data)
+      f.flush()
+      os.fsync(f.fileno())
+    if mode is not None:
+      os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+  except BaseException:
+    try:
+      os.remove(tmp_path)
+    except OSError:
+      pass
+    raise
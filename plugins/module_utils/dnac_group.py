@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 # pylint: disable=missing-module-docstring
 
+import concurrent.futures
 import logging
 
 # import tabulate  # https://pypi.org/project/tabulate/
@@ -14,10 +15,133 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+class GroupIndex:
+  """Index of groups for O(1) lookup
+
+    by_id         id -> group
+    by_name       name -> list of groups, name is not unique (floors in different buildings, etc)
+    by_hierarchy  groupNameHierarchy -> group, ex 'Global/iida/ksg-tp'
+    children      parentId -> list of child groups
+  """
+
+  def __init__(self, group_list):
+    """constructor for GroupIndex class
+
+    Arguments:
+        group_list {list} -- list of group object from /api/v1/group
+    """
+    self.groups = list(group_list or [])
+    self.by_id = {}
+    self.by_name = {}
+    self.by_hierarchy = {}
+    self.children = {}
+
+    for group in self.groups:
+      group_id = group.get('id')
+      if group_id:
+        self.by_id[group_id] = group
+      self.by_name.setdefault(group.get('name'), []).append(group)
+      hierarchy = group.get('groupNameHierarchy')
+      if hierarchy:
+        self.by_hierarchy[hierarchy] = group
+      parent_id = group.get('parentId')
+      if parent_id:
+        self.children.setdefault(parent_id, []).append(group)
+
+
+  def names(self):
+    """list of all group names"""
+    return [group.get('name') for group in self.groups]
+
+
+  def has_name(self, group_name):
+    """return True if group_name exists"""
+    return group_name in self.by_name
+
+
+  def get_by_name(self, group_name):
+    """get the first group which has group_name
+
+    Arguments:
+        group_name {str} -- group name
+
+    Returns:
+        dict or None -- group object
+    """
+    matched = self.by_name.get(group_name)
+    if matched:
+      return matched[0]
+    return None
+
+
+  def get_id_by_name(self, group_name):
+    """get group id only if group_name is unique
+
+    Arguments:
+        group_name {str} -- group name
+
+    Returns:
+        str or None -- group id
+    """
+    matched = self.by_name.get(group_name) or []
+    if len(matched) == 1:
+      return matched[0].get('id')
+    return None
+
+
+  def get_children(self, group_id):
+    """list of child groups
+
+    Arguments:
+        group_id {str} -- parent group id
+
+    Returns:
+        list -- child groups
+    """
+    return self.children.get(group_id, [])
+
+
+
 class DnacGroup(DnacRestClient):
   """Manage Groups
   """
 
+  # argument of the modules, used by the module and by the action plugin running on the controller
+  site_hierarchy_argument_spec = dict(
+    DnacRestClient.argument_spec,
+    sites=dict(type='list', required=True),
+    parent=dict(type='str', default='Global'))
+
+
+  def __init__(self, params):
+    super().__init__(params)
+
+    # GroupIndex built once, invalidated when groups are created or deleted
+    self._group_index = None
+
+
+  def group_index(self):
+    """get index of all groups
+
+    VERSION 1.2
+    '/api/v1/group'
+
+    Returns:
+        GroupIndex or None -- index, None if failed to get group list
+    """
+    if self._group_index is None:
+      group_list = self.get_group_list()
+      if group_list is None:
+        return None
+      self._group_index = GroupIndex(group_list)
+    return self._group_index
+
+
+  def invalidate_group_index(self):
+    """discard index, it will be rebuilt on next lookup"""
+    self._group_index = None
+
+
   def get_group_list(self):
     """get all group
 
@@ -45,31 +169,27 @@ class DnacGroup(DnacRestClient):
     Returns:
         list -- list of all group name
     """
-    group_list = self.get_group_list()
-    if not group_list:
+    index = self.group_index()
+    if not index:
       return []
-    group_names = [group.get('name') for group in group_list]
-    return group_names
+    return index.names()
 
 
   def get_group_by_name(self, group_name):
-    """グループの情報を全部取ってから、フィルタリングした結果を返す。
+    """グループの情報を全部取ってインデックスを作り、そこから検索した結果を返す。
 
     version1.2
 
     Arguments:
-        group_name {[type]} -- [description]
+        group_name {str} -- group name
 
     Returns:
-        [type] -- [description]
+        dict -- group object
     """
-    group_list = self.get_group_list()
-    if not group_list:
+    index = self.group_index()
+    if not index:
       return None
-    matched = [group for group in group_list if group.get('name') == group_name]
-    if len(matched) > 0:
-      return matched[0]
-    return None
+    return index.get_by_name(group_name)
 
 
   # lookup group_id by group_name
@@ -88,21 +208,11 @@ class DnacGroup(DnacRestClient):
     if not group_name:
       return '-1'
 
-    api_path = '/api/v1/group'
-    get_result = self.get(api_path)
-    #   "data": {
-    #     "response": [
-    #       {
-    #         "parentId": "ba06348e-ee80-4058-bb23-f0c9a5fd728b",
-    response = self.extract_data_response(get_result)
-    if not response:
+    index = self.group_index()
+    if not index:
       return '0'
 
-    group_ids = [group.get('id') for group in response if group.get('name') == group_name]
-    if len(group_ids) == 1:
-      return group_ids[0]
-
-    return '0'
+    return index.get_id_by_name(group_name) or '0'
 
 
   def get_site_names_13(self):
@@ -116,23 +226,15 @@ class DnacGroup(DnacRestClient):
     """
     _cache = {}
 
-    api_path = '/dna/intent/api/v1/site/count'
-    get_result = self.get(api_path)
-    if not get_result or get_result.get('failed'):
+    api_path = '/dna/intent/api/v1/site'
+    count_path = '/dna/intent/api/v1/site/count'
+    sites = self.fetch_pages(api_path, count_path=count_path)
+    if sites is None:
       return {}
 
-    count = self.extract_data_response(get_result)
-
-    STEP = 10
-    for start in range(1, count + 1, STEP):
-      api_path = '/dna/intent/api/v1/site?offset={}&limit={}'.format(start, STEP)
-      get_result = self.get(api_path=api_path)
-      if not get_result or get_result.get('failed'):
-        return {}
-      sites = self.extract_data_response(get_result)
-      for site in sites:
-        logging.info("Caching %s", site['groupNameHierarchy'])
-        _cache[site['groupNameHierarchy']] = site
+    for site in sites:
+      logging.info("Caching %s", site['groupNameHierarchy'])
+      _cache[site['groupNameHierarchy']] = site
 
     # add Global
     _cache['Global'] = {'groupNameHierarchy': 'Global', 'additionalInfo': [{'attributes': {'type': 'area'}}]}
@@ -140,6 +242,115 @@ class DnacGroup(DnacRestClient):
     return _cache
 
 
+  def get_site_member_ids(self, site_id):
+    """get ids of devices assigned to the site
+
+    VERSION 1.3
+    '/dna/intent/api/v1/membership/{siteId}'
+
+    Arguments:
+        site_id {str} -- site id
+
+    Returns:
+        list -- list of device id, None if failed
+    """
+    api_path = '/dna/intent/api/v1/membership/{}'.format(site_id)
+    get_result = self.get(api_path)
+    if not get_result or get_result.get('failed'):
+      return None
+
+    # {
+    #   "site": {...},
+    #   "device": [
+    #     {"response": [{device}, ...], "siteId": "..."}
+    #   ]
+    # }
+    data = get_result.get('data')
+    if not isinstance(data, dict):
+      return None
+
+    device_ids = []
+    for member in data.get('device') or []:
+      for device in member.get('response') or []:
+        if device.get('id'):
+          device_ids.append(device.get('id'))
+    return device_ids
+
+
+  def get_site_members(self, sites):
+    """get device ids of each site, membership of the sites are fetched concurrently by workers threads
+
+    Arguments:
+        sites {dict} -- groupNameHierarchy -> site, output of get_site_names_13()
+
+    Returns:
+        dict -- groupNameHierarchy -> list of device id, sites failed to get are omitted
+    """
+    targets = [(hierarchy, site.get('id')) for hierarchy, site in sites.items() if site.get('id')]
+    if not targets:
+      return {}
+
+    members = {}
+    workers = max(min(self._workers, len(targets)), 1)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+      for (hierarchy, _), device_ids in zip(targets, executor.map(lambda target: self.get_site_member_ids(target[1]), targets)):
+        if device_ids is None:
+          logging.warning('failed to get membership of %s', hierarchy)
+          continue
+        members[hierarchy] = device_ids
+    return members
+
+
+  @staticmethod
+  def build_group_payload(group_name, group_type, parent_id, building_info=None):
+    """build payload to create group
+
+    Arguments:
+        group_name {str} -- name of the group
+        group_type {str} -- 'area' or 'building' or 'floor'
+        parent_id {str} -- id of the parent group
+
+    Keyword Arguments:
+        building_info {dict} -- buiding info (default: {None})
+
+    Returns:
+        dict -- payload for POST /api/v1/group
+    """
+    payload = {
+      'groupTypeList': ["SITE"],
+      'name': group_name,
+      'parentId': parent_id,
+      'additionalInfo': [{
+        'nameSpace': "Location",
+        'attributes': {
+          'type': group_type
+        }
+      }]
+    }
+
+    if group_type == "building":
+      payload['additionalInfo'][0]['attributes'].update(building_info or {})
+
+    elif group_type == "floor":
+      payload['additionalInfo'].append({
+        'nameSpace': "mapsSummary",
+        'attributes': {
+          'rfModel': "37037",
+          'floorIndex': "1"
+        }
+      })
+      payload['additionalInfo'].append({
+        'nameSpace': "mapGeometry",
+        'attributes': {
+          'width': "100",
+          'length': "100",
+          'height': "10"
+        }
+      })
+
+    return payload
+
+
   def process_group(self, state='present', group_name='', group_type='area', parent_name='Global', building_info=None):
     """create/delete group object
 
@@ -165,8 +376,11 @@ class DnacGroup(DnacRestClient):
     api_path = '/api/v1/group'
 
     # check if group_name already exists in dna center
-    group_name_list = self.get_group_names()
-    has_group_name = group_name in group_name_list
+    index = self.group_index()
+    if not index:
+      result['msg'] = "failed to get group list"
+      return result
+    has_group_name = index.has_name(group_name)
 
     if state == 'present' and has_group_name:
       result['failed'] = False
@@ -174,50 +388,22 @@ class DnacGroup(DnacRestClient):
 
     elif state == 'present' and not has_group_name:
       # newly create group
-      payload = {
-        'groupTypeList': ["SITE"],
-        'name': group_name,
-        'additionalInfo': [{
-          'nameSpace': "Location",
-          'attributes': {
-            'type': group_type
-          }
-        }]
-      }
-
       # check if parent exists and update 'parentId'
-      has_parent_name = parent_name in group_name_list
+      has_parent_name = index.has_name(parent_name)
       if not has_parent_name:
         result['msg'] = "there is no parent_name in group_name_list"
         return result
       parent_id = self.get_group_id_by_name(parent_name)
-      payload.update({'parentId' : parent_id})
 
       # check if required parameter is provided
-      if group_type == "building":
-        if building_info is None:
-          result['msg'] = "building_info is required to create group of building"
-          return result
-        payload['additionalInfo'][0]['attributes'].update(building_info)
-
-      elif group_type == "floor":
-        payload['additionalInfo'].append({
-          'nameSpace': "mapsSummary",
-          'attributes': {
-            'rfModel': "37037",
-            'floorIndex': "1"
-          }
-        })
-        payload['additionalInfo'].append({
-          'nameSpace': "mapGeometry",
-          'attributes': {
-            'width': "100",
-            'length': "100",
-            'height': "10"
-          }
-        })
+      if group_type == "building" and building_info is None:
+        result['msg'] = "building_info is required to create group of building"
+        return result
+
+      payload = self.build_group_payload(group_name, group_type, parent_id, building_info=building_info)
       create_result = self.create_object(api_path=api_path, data=payload)
       result.update(create_result)
+      self.invalidate_group_index()
 
     elif state == 'absent' and has_group_name:
       # delete it
@@ -225,6 +411,7 @@ class DnacGroup(DnacRestClient):
       api_path = api_path + '/{}'.format(group_id)
       delete_result = self.delete_object(api_path=api_path)
       result.update(delete_result)
+      self.invalidate_group_index()
 
     elif state == 'absent' and not has_group_name:
       # already deleted
@@ -234,6 +421,245 @@ class DnacGroup(DnacRestClient):
     return result
 
 
+  @staticmethod
+  def flatten_site_tree(sites, parent='Global', state='present'):
+    """flatten desired site tree into list of node
+
+    site tree
+      - name: iida
+        type: area
+        children:
+          - name: ksg-tp
+            type: building
+            building_info:
+              address: ...
+            children:
+              - name: ksg-tp-18f
+                type: floor
+      - name: old-area
+        state: absent
+
+    state is inherited by children unless specified.
+
+    Arguments:
+        sites {list} -- list of site
+
+    Keyword Arguments:
+        parent {str} -- groupNameHierarchy of the parent (default: {'Global'})
+        state {str} -- default state, 'present' or 'absent' (default: {'present'})
+
+    Returns:
+        list -- list of dict which has 'name', 'type', 'hierarchy', 'parent', 'depth', 'state' and 'building_info'
+    """
+    nodes = []
+    for site in sites or []:
+      hierarchy = parent + '/' + site.get('name')
+      node_state = site.get('state') or state
+      nodes.append({
+        'name': site.get('name'),
+        'type': site.get('type') or 'area',
+        'hierarchy': hierarchy,
+        'parent': parent,
+        'depth': hierarchy.count('/'),
+        'state': node_state,
+        'building_info': site.get('building_info')
+      })
+      nodes.extend(DnacGroup.flatten_site_tree(site.get('children'), parent=hierarchy, state=node_state))
+    return nodes
+
+
+  def reconcile_site_hierarchy(self, sites, parent='Global', check_mode=False):
+    """create/delete whole site tree at once
+
+    VERSION 1.2
+    '/api/v1/group'
+
+    Desired tree is compared with a single snapshot of current groups.
+    Deletes are processed children first, and then creates are processed parents first.
+    Nodes at the same depth are processed concurrently by workers threads.
+    The snapshot is taken again after each depth of creates to learn the id of new parents.
+
+    Arguments:
+        sites {list} -- desired site tree, see flatten_site_tree()
+
+    Keyword Arguments:
+        parent {str} -- groupNameHierarchy of the root of the tree (default: {'Global'})
+        check_mode {bool} -- report changes without applying (default: {False})
+
+    Returns:
+        dict -- result, 'sites' is the list of report per node
+    """
+    result = {
+      'failed': True,
+      'changed': False
+    }
+
+    index = self.group_index()
+    if not index:
+      result['msg'] = "failed to get group list"
+      return result
+
+    nodes = self.flatten_site_tree(sites, parent=parent)
+    reports = {}
+    creates = []
+    deletes = []
+
+    for node in nodes:
+      report = {
+        'name': node['name'],
+        'type': node['type'],
+        'hierarchy': node['hierarchy'],
+        'action': 'none',
+        'changed': False,
+        'failed': False
+      }
+      reports[node['hierarchy']] = report
+      exists = node['hierarchy'] in index.by_hierarchy
+
+      if node['state'] == 'present' and not exists:
+        if node['type'] == 'building' and node.get('building_info') is None:
+          report['failed'] = True
+          report['msg'] = "building_info is required to create group of building"
+          continue
+        report['action'] = 'create'
+        creates.append(node)
+      elif node['state'] == 'absent' and exists:
+        report['action'] = 'delete'
+        deletes.append(node)
+
+    # existing descendants of deleted node must be deleted before it
+    delete_hierarchies = set(node['hierarchy'] for node in deletes)
+    for hierarchy, group in index.by_hierarchy.items():
+      if hierarchy in delete_hierarchies:
+        continue
+      if any(hierarchy.startswith(h + '/') for h in delete_hierarchies):
+        node = {'name': group.get('name'), 'type': None, 'hierarchy': hierarchy, 'depth': hierarchy.count('/')}
+        reports[hierarchy] = {
+          'name': group.get('name'),
+          'type': None,
+          'hierarchy': hierarchy,
+          'action': 'delete',
+          'changed': False,
+          'failed': False
+        }
+        deletes.append(node)
+
+    if check_mode:
+      for report in reports.values():
+        report['changed'] = report['action'] != 'none'
+      result['failed'] = any(report['failed'] for report in reports.values())
+      result['changed'] = any(report['changed'] for report in reports.values())
+      result['msg'] = 'did nothing because of check mode'
+      result['sites'] = list(reports.values())
+      return result
+
+    # the next level depends on the tasks of this level,
+    # so task_wait=False is honored only at the last level
+    task_wait = self.task_wait()
+
+    # deletes, children first
+    delete_depths = sorted(set(node['depth'] for node in deletes), reverse=True)
+    for depth in delete_depths:
+      level = [node for node in deletes if node['depth'] == depth]
+      self.task_wait(task_wait or depth != delete_depths[-1] or bool(creates))
+      self._run_concurrently(self._delete_site_node, level, index, reports)
+    self.task_wait(task_wait)
+
+    if deletes:
+      self.invalidate_group_index()
+      index = self.group_index()
+      if not index:
+        result['msg'] = "failed to get group list"
+        for node in creates:
+          reports[node['hierarchy']]['failed'] = True
+          reports[node['hierarchy']]['msg'] = "not created, failed to get group list"
+        creates = []
+
+    # creates, parents first
+    create_depths = sorted(set(node['depth'] for node in creates))
+    for depth in create_depths:
+      level = []
+      for node in [node for node in creates if node['depth'] == depth]:
+        parent_report = reports.get(node['parent'])
+        if parent_report and parent_report['failed']:
+          reports[node['hierarchy']]['failed'] = True
+          reports[node['hierarchy']]['msg'] = "parent {} failed".format(node['parent'])
+          continue
+        level.append(node)
+      self.task_wait(task_wait or depth != create_depths[-1])
+      self._run_concurrently(self._create_site_node, level, index, reports)
+      self.task_wait(task_wait)
+      self.invalidate_group_index()
+      # the next level needs ids of this level, nothing needs them after the last level
+      if depth == create_depths[-1]:
+        break
+      index = self.group_index()
+      if not index:
+        result['msg'] = "failed to get group list"
+        for node in creates:
+          if node['depth'] > depth:
+            reports[node['hierarchy']]['failed'] = True
+            reports[node['hierarchy']]['msg'] = "not created, failed to get group list"
+        break
+
+    result['failed'] = any(report['failed'] for report in reports.values()) or not index
+    result['changed'] = any(report['changed'] for report in reports.values())
+    result['sites'] = list(reports.values())
+    return result
+
+
+  def _run_concurrently(self, func, nodes, index, reports):
+    """call func(node, index) for each node by thread pool and update reports"""
+    if not nodes:
+      return
+    workers = max(min(self._workers, len(nodes)), 1)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+      for node, node_result in zip(nodes, executor.map(lambda node: func(node, index), nodes)):
+        report = reports[node['hierarchy']]
+        report['changed'] = bool(node_result.get('changed'))
+        report['failed'] = bool(node_result.get('failed'))
+        if node_result.get('msg'):
+          report['msg'] = node_result.get('msg')
+
+
+  def _create_site_node(self, node, index):
+    """create a node of the site tree"""
+    parent = index.by_hierarchy.get(node['parent'])
+    if not parent:
+      return {'failed': True, 'msg': "parent {} not found".format(node['parent'])}
+    payload = self.build_group_payload(node['name'], node['type'], parent.get('id'), building_info=node.get('building_info'))
+    return self.create_object(api_path='/api/v1/group', data=payload)
+
+
+  def _delete_site_node(self, node, index):
+    """delete a node of the site tree"""
+    group = index.by_hierarchy.get(node['hierarchy'])
+    if not group:
+      return {'failed': False, 'msg': "already absent"}
+    return self.delete_object(api_path='/api/v1/group/{}'.format(group.get('id')))
+
+
+  def execute_module_site_hierarchy(self, check_mode=False):
+    """execute ansible module
+
+    Keyword Arguments:
+        check_mode {bool} -- Check mode or not (default: {False})
+
+    Returns:
+        dict -- Object of the result
+    """
+    sites = self.params.get('sites') or []
+    parent = self.params.get('parent') or 'Global'
+
+    result = self.reconcile_site_hierarchy(sites, parent=parent, check_mode=check_mode)
+
+    result['session_stats'] = self.session_stats()
+    result['request_stats'] = self.request_stats()
+    result['cache_stats'] = self.cache_stats()
+
+    return result
+
+
 if __name__ == '__main__':
 
   import json
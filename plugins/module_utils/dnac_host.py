@@ -4,13 +4,16 @@
 
 import logging
 
-import tabulate  # https://pypi.org/project/tabulate/
-
 try:
   from dnac_rest_client import DnacRestClient
 except ImportError:
   from ansible_collections.iida.dnac.plugins.module_utils.dnac_rest_client import DnacRestClient
 
+try:
+  from dnac_compact import CompactTable
+except ImportError:
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_compact import CompactTable
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,25 +21,63 @@ class DnacHost(DnacRestClient):
   """Manage Network Hosts
   """
 
-  def get_host_list(self):
+  # columns of compact host list, used by show_host_list()
+  HOST_COLUMNS = [
+    'id',
+    'hostIp',
+    'hostMac',
+    'hostType',
+    'connectedNetworkDeviceName',
+    'connectedNetworkDeviceIpAddress',
+    'connectedInterfaceName',
+    'vlanId'
+  ]
+
+  def iter_host_list(self, filters=None, fields=None):
+    """Iterate over all host objects page by page
+
+    version 1.2
+    /api/v1/host?offset={offset}&limit={limit}
+
+    Keyword Arguments:
+        filters {dict or list} -- query parameters, ex {'hostType': 'wired', 'vlanId': 10} (default: {None})
+        fields {list} -- keys to be kept in each host (default: {None})
+
+    Returns:
+        DnacPager -- iterable object of host object
+    """
+    api_path = '/api/v1/host'
+    return self.paginate(api_path, params=filters, fields=fields)
+
+
+  def get_host_list(self, filters=None, fields=None, compact=False):
     """get host object list
 
     version 1.2
-    /api/v1/host
+    /api/v1/host/count
+    /api/v1/host?offset={offset}&limit={limit}
+
+    The count does not reflect filters, so filtered list is fetched serially.
+
+    Keyword Arguments:
+        filters {dict or list} -- query parameters, ex {'connectedNetworkDeviceIpAddress': '10.0.0.1'} (default: {None})
+        fields {list} -- keys to be kept in each host (default: {None})
+        compact {bool} -- return CompactTable of fields or HOST_COLUMNS (default: {False})
 
     Returns:
-        list -- List of host object
+        list or CompactTable -- List of host object, None if failed
     """
     api_path = '/api/v1/host'
-    get_result = self.get(api_path=api_path)
-    return self.extract_data_response(get_result)
+    count_path = None if filters else '/api/v1/host/count'
+    into = CompactTable(['id'] + [f for f in fields if f != 'id'] if fields else self.HOST_COLUMNS) if compact else None
+    return self.fetch_pages(api_path, params=filters, count_path=count_path, fields=fields, into=into)
 
 
   def show_host_list(self, host_list=None):
     """Print host list
 
     Keyword Arguments:
-        host_list {list} -- List of host object (default: {None})
+        host_list {list or CompactTable} -- List of host object (default: {None})
     """
     if not host_list:
       print("no host is found.")
@@ -54,7 +95,7 @@ class DnacHost(DnacRestClient):
       vlan_id = host.get('vlanId')
       table.append([host_ip, host_mac, host_type, connected_device_name, connected_device_addr, connected_intf_name, vlan_id])
 
-    print(tabulate.tabulate(table, headers, tablefmt='simple'))
+    self.print_table(table, headers)
 
 
   def get_host_by_id(self, host_id=None):
@@ -92,7 +133,7 @@ class DnacHost(DnacRestClient):
     for key in want_key:
       table.append(get_row(key))
 
-    print(tabulate.tabulate(table, headers, tablefmt='simple'))
+    self.print_table(table, headers)
 
 
   def get_host_by_ip(self, ip=None):
@@ -131,7 +172,7 @@ if __name__ == '__main__':
     drc = DnacHost(params)
 
     # get host list
-    host_list = drc.get_host_list()
+    host_list = drc.get_host_list(compact=True)
     drc.show_host_list(host_list=host_list)
 
     # for example
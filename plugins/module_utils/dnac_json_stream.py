@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Incremental parser of large json response.
+
+  DNA Center returns bulk data as a single json object
+
+  {
+    "response": [
+      { ... item 1 ... },
+      { ... item 2 ... }
+    ],
+    "version": "1.0"
+  }
+
+  DnacJsonStream yields the items of the array one by one,
+  so only one item is kept in memory at a time.
+
+"""
+
+import codecs
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DnacJsonStream:
+  """Iterate items of the top level array in streamed json
+  """
+
+  WHITESPACE = ' \t\n\r'
+
+  def __init__(self, chunks):
+    """constructor for DnacJsonStream class
+
+    Arguments:
+        chunks {iterable} -- bytes chunks, ex requests.Response.iter_content()
+    """
+    self._chunks = iter(chunks)
+    self._decoder = json.JSONDecoder()
+    self._utf8 = codecs.getincrementaldecoder('utf-8')()
+    self._buf = ''
+    self._pos = 0
+    self._eof = False
+
+
+  def _read(self):
+    """Read next chunk into the buffer.
+
+    Returns:
+        bool -- False if no more chunk
+    """
+    if self._eof:
+      return False
+
+    # drop consumed text
+    if self._pos:
+      self._buf = self._buf[self._pos:]
+      self._pos = 0
+
+    try:
+      chunk = next(self._chunks)
+    except StopIteration:
+      self._eof = True
+      self._buf += self._utf8.decode(b'', final=True)
+      return False
+
+    self._buf += self._utf8.decode(chunk)
+    return True
+
+
+  def _peek(self):
+    """Skip whitespaces and return the next character, '' at the end."""
+    while True:
+      while self._pos < len(self._buf) and self._buf[self._pos] in self.WHITESPACE:
+        self._pos += 1
+      if self._pos < len(self._buf):
+        return self._buf[self._pos]
+      if not self._read():
+        return ''
+
+
+  def _expect(self, chars):
+    c = self._peek()
+    if c not in chars:
+      raise ValueError("expected {} but got {!r}".format(' or '.join(chars), c))
+    self._pos += 1
+    return c
+
+
+  def _value(self):
+    """Decode next json value, reading chunks until it is complete."""
+    self._peek()
+    while True:
+      try:
+        value, end = self._decoder.raw_decode(self._buf, self._pos)
+      except ValueError:
+        # incomplete value, read at least as much as the buffer to keep it linear
+        need = len(self._buf) * 2
+        if not self._read():
+          raise
+        while len(self._buf) < need and self._read():
+          pass
+        continue
+
+      # a number might continue in the next chunk
+      if end == len(self._buf) and not self._eof and isinstance(value, (int, float)):
+        self._read()
+        continue
+
+      self._pos = end
+      return value
+
+
+  def iter_items(self, key='response'):
+    """Yield items of the array.
+
+    Keyword Arguments:
+        key {str} -- key of the array in the top level object (default: {'response'})
+
+    Yields:
+        object -- decoded item
+    """
+    self._expect('{')
+    if self._peek() == '}':
+      return
+
+    while True:
+      name = self._value()
+      self._expect(':')
+
+      if name == key and self._peek() == '[':
+        self._pos += 1
+        if self._peek() == ']':
+          self._pos += 1
+        else:
+          while True:
+            yield self._value()
+            if self._expect(',]') == ']':
+              break
+      else:
+        # other values are small, ex "version": "1.0"
+        self._value()
+
+      if self._expect(',}') == '}':
+        return
@@ -4,13 +4,7 @@
 
 import json
 import logging
-import datetime
-
-try:
-  HAS_TABULATE = True
-  import tabulate
-except ImportError:
-  HAS_TABULATE = False
+import time
 
 try:
   from dnac_rest_client import DnacRestClient
@@ -23,18 +17,33 @@ class DnacPathTrace(DnacRestClient):
   """Manage Path Trace
   """
 
+  def iter_path_trace(self):
+    """Iterate over all previous Pathtraces summary page by page
+
+    version 1.2
+    /dna/intent/api/v1/flow-analysis?offset={offset}&limit={limit}
+
+    Returns:
+        DnacPager -- iterable object of path trace object
+    """
+    api_path = '/dna/intent/api/v1/flow-analysis'
+    return self.paginate(api_path)
+
+
   def get_path_trace(self):
     """Retrives all previous Pathtraces summary
 
     version 1.2
-    /dna/intent/api/v1/flow-analysis
+    /dna/intent/api/v1/flow-analysis?offset={offset}&limit={limit}
 
     Returns:
-        list -- List of path trace object
+        list -- List of path trace object, None if failed
     """
-    api_path = '/dna/intent/api/v1/flow-analysis'
-    get_result = self.get(api_path=api_path)
-    return self.extract_data_response(get_result)
+    pager = self.iter_path_trace()
+    path_trace_list = list(pager)
+    if pager.failed:
+      return None
+    return path_trace_list
 
 
   def get_path_trace_by_id(self, path_id):
@@ -78,7 +87,7 @@ class DnacPathTrace(DnacRestClient):
       egress_name = element.get('egressInterface', {}).get('physicalInterface', {}).get('name') or '-'
       table.append([element_name, element_ip, element_type, ingress_name, egress_name])
 
-    print(tabulate.tabulate(table, headers, tablefmt='simple'))
+    self.print_table(table, headers)
 
 
   def show_path_trace_list(self, path_trace_list):
@@ -103,8 +112,7 @@ class DnacPathTrace(DnacRestClient):
 
       create_time = path.get('createTime')  # this is int
       create_time /= 1000  # from msec to sec
-      create_time = datetime.datetime.fromtimestamp(create_time)
-      create_time = create_time.strftime('%Y-%m-%d %H:%M:%S')
+      create_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(create_time))
 
       inclusions = path.get('inclusions') or []
       inclusions = ', '.join(inclusions)
@@ -113,7 +121,7 @@ class DnacPathTrace(DnacRestClient):
 
       table.append([source_ip, dest_ip, status, create_time, path_id, inclusions])
 
-    print(tabulate.tabulate(table, headers, tablefmt='simple'))
+    self.print_table(table, headers)
 
 
   def create_path_trace(self, src_ip=None, dst_ip=None, src_port=None, dst_port=None):
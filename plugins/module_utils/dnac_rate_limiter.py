@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Token bucket rate limiter shared by processes on the same controller.
+
+  state of the bucket is stored in a json file in log_dir,
+  and the file is protected by fcntl.flock()
+
+  {
+    "sandboxdnac2.cisco.com.devnetuser": {
+      "tokens": 3.5,
+      "updated": 1578900000.123
+    }
+  }
+
+"""
+
+import fcntl
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class DnacRateLimiter:
+  """Token bucket rate limiter
+  """
+
+  def __init__(self, path, key, rate, burst=1):
+    """constructor for DnacRateLimiter class
+
+    Arguments:
+        path {str} -- path of the state file
+        key {str} -- key of the bucket, URL + '.' + username
+        rate {float} -- number of requests allowed per second
+
+    Keyword Arguments:
+        burst {int} -- capacity of the bucket (default: {1})
+    """
+    self.path = path
+    self.key = key
+    self.rate = float(rate)
+    self.burst = max(int(burst), 1)
+
+
+  def acquire(self):
+    """Take one token from the bucket, sleep until it is available.
+
+    Returns:
+        float -- seconds waited
+    """
+    waited = 0.0
+    while True:
+      wait = self._take()
+      if wait <= 0:
+        return waited
+      logging.info("rate limit of %s reached. Sleeping %.2f seconds...", self.key, wait)
+      time.sleep(wait)
+      waited += wait
+
+
+  def _take(self):
+    """Try to take one token.
+
+    Returns:
+        float -- 0 if token is taken, otherwise seconds to wait
+    """
+    with open(self.path, 'a+', encoding='UTF-8') as f:
+      # block until lock file
+      fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+      try:
+        f.seek(0)
+        try:
+          data = json.loads(f.read() or '{}')
+        except ValueError:
+          data = {}
+
+        now = time.time()
+        bucket = data.get(self.key) or {'tokens': self.burst, 'updated': now}
+
+        # refill
+        elapsed = max(now - bucket.get('updated', now), 0)
+        tokens = min(self.burst, bucket.get('tokens', self.burst) + elapsed * self.rate)
+
+        if tokens >= 1:
+          tokens -= 1
+          wait = 0.0
+        else:
+          wait = (1 - tokens) / self.rate
+
+        data[self.key] = {'tokens': tokens, 'updated': now}
+
+        f.seek(0)
+        f.truncate()
+        f.write(json.dumps(data))
+        f.flush()
+      finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    return wait
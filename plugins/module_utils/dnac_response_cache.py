@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""On-disk cache of GET results.
+
+  cache_dir/
+    sandboxdnac2.cisco.com/
+      {sha256 of host, port, api_path and params}.json
+
+  {
+    "stored": 1578900000.123,
+    "etag": "\"abc\"",
+    "last_modified": "Mon, 13 Jan 2020 11:16:03 GMT",
+    "result": { ... result of DnacRestClient.get() ... }
+  }
+
+  mtime of the file is updated on every hit,
+  and the least recently used files are removed when the number of files exceeds max_entries.
+
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+
+try:
+  from dnac_file_util import atomic_write, safe_name
+except ImportError:
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_file_util import atomic_write, safe_name
+
+logger = logging.getLogger(__name__)
+
+
+class DnacResponseCache:
+  """Size bounded LRU cache stored as json files
+  """
+
+  def __init__(self, cache_dir, host, max_entries=256):
+    """constructor for DnacResponseCache class
+
+    Arguments:
+        cache_dir {str} -- root directory of the cache
+        host {str} -- target hostname fqdn or ip addr
+
+    Keyword Arguments:
+        max_entries {int} -- max number of cached responses (default: {256})
+    """
+    self.cache_dir = os.path.join(cache_dir, safe_name(host))
+    os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+    self.max_entries = max_entries
+
+
+  @staticmethod
+  def make_key(*args):
+    """Make cache key from request identifiers.
+
+    Returns:
+        str -- hex digest
+    """
+    text = json.dumps(args, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('UTF-8')).hexdigest()
+
+
+  def _path(self, key):
+    return os.path.join(self.cache_dir, key + '.json')
+
+
+  def get(self, key):
+    """Get cached entry and mark it as recently used.
+
+    Arguments:
+        key {str} -- cache key
+
+    Returns:
+        dict or None -- cached entry
+    """
+    path = self._path(key)
+    try:
+      with open(path, encoding='UTF-8') as f:
+        entry = json.load(f)
+      os.utime(path)
+    except FileNotFoundError:
+      return None
+    except (IOError, OSError, ValueError) as e:
+      logging.exception(e)
+      return None
+    return entry
+
+
+  def put(self, key, result, etag=None, last_modified=None):
+    """Store result of GET.
+
+    Arguments:
+        key {str} -- cache key
+        result {dict} -- result of DnacRestClient.get()
+
+    Keyword Arguments:
+        etag {str} -- ETag header of the response (default: {None})
+        last_modified {str} -- Last-Modified header of the response (default: {None})
+    """
+    entry = {
+      'stored': time.time(),
+      'etag': etag,
+      'last_modified': last_modified,
+      'result': result
+    }
+
+    # best effort, a failure to store must not fail the GET
+    try:
+      # clear() of another process may have removed the directory
+      os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+      atomic_write(self._path(key), json.dumps(entry))
+    except (IOError, OSError, TypeError, ValueError) as e:
+      logging.exception(e)
+      return
+
+    self.evict()
+
+
+  def evict(self):
+    """Remove least recently used entries over max_entries."""
+    entries = []
+    try:
+      for e in os.scandir(self.cache_dir):
+        if e.name.endswith('.json') and not e.name.startswith('.'):
+          entries.append((e.stat().st_mtime, e.path))
+    except OSError:
+      # another process is evicting at the same time
+      return
+
+    over = len(entries) - self.max_entries
+    if over <= 0:
+      return
+
+    entries.sort()
+    for _, path in entries[:over]:
+      try:
+        os.remove(path)
+      except OSError:
+        pass
+
+
+  def clear(self):
+    """Remove all entries of the host."""
+    shutil.rmtree(self.cache_dir, ignore_errors=True)
+    os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
@@ -11,34 +11,97 @@
     - requests
     - pyjwt (optional)
 
+  requests, pyjwt and tabulate are imported on first use,
+  so a run which is served from the token cache does not pay for them.
+
 """
 
-import datetime
+import collections
+import concurrent.futures
 import fcntl
 import functools
+import itertools
 import time
 import json
 import logging
 import os
-import pickle
+import random
 import sys
+import threading
 
-try:
-  import requests
-  requests.packages.urllib3.disable_warnings()
-except ImportError as e:
-  logging.exception(e)
-  sys.exit(1)
+from urllib.parse import urlencode
 
 try:
-  import jwt  # pip install pyjwt
-  HAS_JWT = True
-except ImportError as e:
-  import base64  # decode jwt by hand
-  HAS_JWT = False
+  from dnac_rate_limiter import DnacRateLimiter
+  from dnac_response_cache import DnacResponseCache
+  from dnac_task_journal import DnacTaskJournal
+  from dnac_token_store import DnacTokenStore
+except ImportError:
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_rate_limiter import DnacRateLimiter
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_response_cache import DnacResponseCache
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_task_journal import DnacTaskJournal
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_token_store import DnacTokenStore
 
 logger = logging.getLogger(__name__)
 
+# requests.Session objects shared by DnacRestClient instances in this process
+# key: (pid, host, port, pool_size, max_retries)
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+# tokens shared by DnacRestClient instances in this process
+# key: (host, username), value: (token, exp)
+_TOKENS = {}
+_TOKENS_LOCK = threading.Lock()
+
+# (host, username) of which token is being refreshed in background
+_REFRESHING = set()
+
+# semaphores to limit the number of in-flight requests in this process
+# key: (pid, host, port)
+_INFLIGHT = {}
+
+# requests module, imported by load_requests()
+requests = None
+
+
+def load_requests():
+  """Import requests module on first use.
+
+  Returns:
+      module -- requests module
+  """
+  global requests  # pylint: disable=global-statement,invalid-name
+  if requests is None:
+    try:
+      import requests as _requests  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+      logging.exception(e)
+      sys.exit(1)
+    _requests.packages.urllib3.disable_warnings()
+    requests = _requests
+  return requests
+
+
+# pyjwt module, imported by load_jwt(), False if not installed
+jwt = None
+
+
+def load_jwt():
+  """Import pyjwt module on first use.
+
+  Returns:
+      module or False -- jwt module, False if not installed
+  """
+  global jwt  # pylint: disable=global-statement,invalid-name
+  if jwt is None:
+    try:
+      import jwt as _jwt  # pylint: disable=import-outside-toplevel
+    except ImportError:
+      _jwt = False
+    jwt = _jwt
+  return jwt
+
 
 class DnacRestClient:
   """Common operation to access to cisco dna center via rest api.
@@ -52,10 +115,40 @@ class DnacRestClient:
   DEFAULT_LOGDIR = '/tmp'
   DEFAULT_CHECKMODE = False
   DEFAULT_TIMEOUT = 30  # timeout used in requests module, default is 30 sec
+  DEFAULT_POOL_SIZE = 10  # max number of connections kept in the pool per host
+  DEFAULT_KEEPALIVE = True
+  DEFAULT_MAX_RETRIES = 0  # retries on connection errors, 0 means no retry
+  DEFAULT_PAGE_SIZE = 500  # number of records in a page of paged api
+  DEFAULT_WORKERS = 1  # number of threads to fetch pages concurrently, 1 means serial
+  DEFAULT_MAX_INFLIGHT = 8  # max number of concurrent requests to a host in this process
+  DEFAULT_RATE_LIMIT = 0  # requests per second shared by processes, 0 means unlimited
+  DEFAULT_RATE_BURST = 5
+  DEFAULT_BACKOFF_RETRIES = 3  # retries on 429/503
+  DEFAULT_BACKOFF_FACTOR = 1.0  # base of exponential backoff in sec
+  DEFAULT_BACKOFF_MAX = 60  # upper limit of a backoff in sec
+  DEFAULT_TOKEN_REFRESH_AHEAD = 600  # refresh token in background when it expires within this sec
+  DEFAULT_CACHE_TTL = 0  # lifetime of cached GET result in sec, 0 means no cache
+  DEFAULT_CACHE_MAX_ENTRIES = 256
+
+  # lifetime of cached GET result per api path prefix, overrides cache_ttl
+  # status of the task and path trace must be always fresh
+  CACHE_TTL_BY_PATH = {
+    '/dna/intent/api/v1/task': 0,
+    '/dna/intent/api/v1/flow-analysis': 0
+  }
+
+  # status codes to be retried with backoff
+  RETRY_STATUS_CODES = (429, 503)
+
+  # parameters for paged api
+  PAGE_OFFSET_BASE = 1  # offset of the first record, dna center starts from 1
+  MAX_PAGE_SIZE = 500  # max value of limit accepted by intent api
 
   # parameters for async operation
-  RETRY_INTERVAL = 2
-  MAX_RETRY_COUNT = 10
+  DEFAULT_TASK_TIMEOUT = 300  # overall deadline to wait for tasks in sec
+  DEFAULT_TASK_POLL_INTERVAL = 0.5  # first interval of polling in sec
+  DEFAULT_TASK_POLL_MAX_INTERVAL = 10  # interval grows up to this value
+  TASK_POLL_BACKOFF = 1.5  # interval is multiplied by this value after each poll
 
   # common argument for ansible module
   argument_spec = dict(
@@ -67,8 +160,37 @@ class DnacRestClient:
     http_proxy=dict(type='str'),
     log=dict(default=False, type='bool'),
     log_dir=dict(type='path'),
+    cache_ttl=dict(default=0, type='int'),
+    cache_ttl_by_path=dict(type='dict'),
+    cache_dir=dict(type='path'),
+    cache_max_entries=dict(default=256, type='int'),
+    pool_size=dict(default=10, type='int'),
+    keepalive=dict(default=True, type='bool'),
+    max_retries=dict(default=0, type='int'),
+    page_size=dict(default=500, type='int'),
+    workers=dict(default=1, type='int'),
+    max_inflight=dict(default=8, type='int'),
+    rate_limit=dict(default=0, type='float'),
+    rate_burst=dict(default=5, type='int'),
+    backoff_retries=dict(default=3, type='int'),
+    backoff_factor=dict(default=1.0, type='float'),
+    backoff_max=dict(default=60, type='int'),
+    token_refresh_ahead=dict(default=600, type='int'),
+    task_wait=dict(default=True, type='bool'),
+    task_timeout=dict(default=300, type='int'),
+    task_poll_interval=dict(default=0.5, type='float'),
+    task_poll_max_interval=dict(default=10, type='float'),
+    device_index_ttl=dict(default=300, type='int'),
     debug=dict(default=False, type='bool'))
 
+  # argument of the modules, used by the module and by the action plugin running on the controller
+  token_argument_spec = dict(argument_spec)
+
+  task_status_argument_spec = dict(
+    argument_spec,
+    task_ids=dict(type='list'),
+    purge=dict(type='bool', default=True))
+
 
   def __init__(self, params):
     """constructor for DnacRestClient class
@@ -82,6 +204,27 @@ class DnacRestClient:
       - timeout
       - http_proxy
       - runsync
+      - cache_ttl
+      - cache_ttl_by_path
+      - cache_dir
+      - cache_max_entries
+      - pool_size
+      - keepalive
+      - max_retries
+      - page_size
+      - workers
+      - max_inflight
+      - rate_limit
+      - rate_burst
+      - backoff_retries
+      - backoff_factor
+      - backoff_max
+      - token_refresh_ahead
+      - task_wait
+      - task_timeout
+      - task_poll_interval
+      - task_poll_max_interval
+      - device_index_ttl
 
     Arguments:
         params {dict} -- param dictionary
@@ -95,15 +238,15 @@ class DnacRestClient:
     # use this filename for app name
     app_name = os.path.splitext(os.path.basename(__file__))[0]
 
-    # file name of token cache
-    token_filename = "{}.pickle".format(app_name)
-
     # directory name of token cache, /tmp is used if not specified
     self.log_dir = params.get('log_dir', self.DEFAULT_LOGDIR)
     os.makedirs(self.log_dir, exist_ok=True)
 
+    # token cache, one json file per controller
+    self.token_store = DnacTokenStore(self.log_dir, app_name, params.get('host'))
+
     # path of token cache
-    self.token_path = os.path.join(self.log_dir, token_filename)
+    self.token_path = self.token_store.path
 
     # file name of lock file
     lock_filename = "{}.lock".format(app_name)
@@ -145,6 +288,85 @@ class DnacRestClient:
     # force sync operation, default is False
     self._runsync = params.get('runsync', False)
 
+    # connection pool of the shared requests.Session
+    self._pool_size = params.get('pool_size') or self.DEFAULT_POOL_SIZE
+    self._max_retries = params.get('max_retries') or self.DEFAULT_MAX_RETRIES
+    keepalive = params.get('keepalive')
+    self._keepalive = self.DEFAULT_KEEPALIVE if keepalive is None else keepalive
+
+    # number of records in a page of paged api
+    self._page_size = min(params.get('page_size') or self.DEFAULT_PAGE_SIZE, self.MAX_PAGE_SIZE)
+
+    # concurrency of page fetching, bounded by max_inflight
+    self._workers = params.get('workers') or self.DEFAULT_WORKERS
+    self._max_inflight = params.get('max_inflight') or self.DEFAULT_MAX_INFLIGHT
+
+    # token bucket shared by processes on this controller, key is URL + '.' + username
+    rate_limit = params.get('rate_limit') or self.DEFAULT_RATE_LIMIT
+    if rate_limit > 0:
+      self._rate_limiter = DnacRateLimiter(
+        os.path.join(self.log_dir, "{}.ratelimit".format(app_name)),
+        self._host + '.' + self._username,
+        rate_limit,
+        burst=params.get('rate_burst') or self.DEFAULT_RATE_BURST)
+    else:
+      self._rate_limiter = None
+
+    # backoff on 429 Too Many Requests and 503 Service Unavailable
+    backoff_retries = params.get('backoff_retries')
+    self._backoff_retries = self.DEFAULT_BACKOFF_RETRIES if backoff_retries is None else backoff_retries
+    self._backoff_factor = params.get('backoff_factor') or self.DEFAULT_BACKOFF_FACTOR
+    self._backoff_max = params.get('backoff_max') or self.DEFAULT_BACKOFF_MAX
+
+    # refresh token proactively ahead of expiry
+    token_refresh_ahead = params.get('token_refresh_ahead')
+    self._token_refresh_ahead = self.DEFAULT_TOKEN_REFRESH_AHEAD if token_refresh_ahead is None else token_refresh_ahead
+
+    # wait for async task, or record the task id in the journal and return immediately
+    task_wait = params.get('task_wait')
+    self._task_wait = True if task_wait is None else task_wait
+    self.task_journal = DnacTaskJournal(os.path.join(self.log_dir, "{}.tasks.jsonl".format(app_name)))
+
+    # polling of async task
+    self._task_timeout = params.get('task_timeout') or self.DEFAULT_TASK_TIMEOUT
+    self._task_poll_interval = params.get('task_poll_interval') or self.DEFAULT_TASK_POLL_INTERVAL
+    self._task_poll_max_interval = params.get('task_poll_max_interval') or self.DEFAULT_TASK_POLL_MAX_INTERVAL
+
+    # on-disk cache of GET result, disabled if cache_ttl is 0 and cache_ttl_by_path is empty
+    self._cache_ttl = params.get('cache_ttl') or self.DEFAULT_CACHE_TTL
+    self._cache_ttl_by_path = dict(self.CACHE_TTL_BY_PATH)
+    for prefix, ttl in (params.get('cache_ttl_by_path') or {}).items():
+      try:
+        self._cache_ttl_by_path[prefix] = int(float(ttl))
+      except (TypeError, ValueError):
+        logging.warning("cache_ttl_by_path of %s is ignored, %s is not a number", prefix, ttl)
+    if self._cache_ttl > 0 or any(ttl > 0 for ttl in self._cache_ttl_by_path.values()):
+      self._response_cache = DnacResponseCache(
+        params.get('cache_dir') or os.path.join(self.log_dir, 'cache'),
+        self._host,
+        max_entries=params.get('cache_max_entries') or self.DEFAULT_CACHE_MAX_ENTRIES)
+    else:
+      self._response_cache = None
+
+    self._cache_stats = {
+      'hits': 0,
+      'misses': 0,
+      'revalidated': 0
+    }
+
+    # persistent connection of httpapi plugin, set by connection()
+    self._connection = None
+
+    # counters of the request path
+    self._request_stats = {
+      'retries': 0,
+      'retry_wait': 0.0,
+      'rate_limit_wait': 0.0,
+      'token_refreshes': 0,
+      'token_background_refreshes': 0,
+      'replays': 0
+    }
+
     # on memory cache for async operation
     # async operation repeats get method until process end
     self._token = ''
@@ -208,62 +430,251 @@ class DnacRestClient:
     self._runsync = _[0]
     return self
 
+  def pool_size(self, *_):
+    """get/set _pool_size"""
+    if not _:
+      return self._pool_size
+    self._pool_size = _[0]
+    return self
+
+  def keepalive(self, *_):
+    """get/set _keepalive"""
+    if not _:
+      return self._keepalive
+    self._keepalive = _[0]
+    return self
+
+  def max_retries(self, *_):
+    """get/set _max_retries"""
+    if not _:
+      return self._max_retries
+    self._max_retries = _[0]
+    return self
+
+  def page_size(self, *_):
+    """get/set _page_size"""
+    if not _:
+      return self._page_size
+    self._page_size = min(_[0], self.MAX_PAGE_SIZE)
+    return self
+
+  def task_wait(self, *_):
+    """get/set _task_wait"""
+    if not _:
+      return self._task_wait
+    self._task_wait = _[0]
+    return self
+
+  def workers(self, *_):
+    """get/set _workers"""
+    if not _:
+      return self._workers
+    self._workers = _[0]
+    return self
+
+
+  def connection(self, *_):
+    """getter/setter of the persistent connection
+
+    If set, requests are sent by iida.dnac.dnac httpapi plugin
+    via ansible.module_utils.connection.Connection,
+    and the token is owned by the plugin.
+    """
+    if not _:
+      return self._connection
+    self._connection = _[0]
+    return self
+
+
+  @staticmethod
+  def is_dnac_connection(connection):
+    """return True if connection is the persistent connection of iida.dnac.dnac httpapi plugin
+
+    network_cli and netconf are persistent too, but they do not speak rest api.
+
+    Arguments:
+        connection {Connection} -- ansible.module_utils.connection.Connection
+
+    Returns:
+        bool -- True if ansible_network_os is iida.dnac.dnac
+    """
+    from ansible.module_utils.connection import ConnectionError as AnsibleConnectionError  # pylint: disable=import-outside-toplevel
+    try:
+      network_os = connection.get_option('network_os')
+    except AnsibleConnectionError:
+      return False
+    return (network_os or '').split('.')[-1] == 'dnac'
+
+
+  def session(self):
+    """Get requests.Session shared in this process.
+
+    The session is created per process and per target host,
+    so that TCP and TLS connections are reused by following requests.
+    Ansible forks worker processes, so process id is a part of the key
+    in order not to share sockets between processes.
+
+    Returns:
+        requests.Session -- session with connection pool
+    """
+    load_requests()
+
+    key = (os.getpid(), self._host, self._port, self._pool_size, self._max_retries)
+    with _SESSIONS_LOCK:
+      session = _SESSIONS.get(key)
+      if session is None:
+        logging.info('create new session for %s:%s, pool_size %s', self._host, self._port, self._pool_size)
+        # max_retries is applied to connection errors only, not to the failed requests
+        adapter = requests.adapters.HTTPAdapter(
+          pool_connections=2,  # host:port for api and host:443 for authentication
+          pool_maxsize=self._pool_size,
+          max_retries=self._max_retries)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _SESSIONS[key] = session
+    return session
+
+
+  def inflight(self):
+    """Get semaphore which limits in-flight requests to the host.
+
+    The semaphore is shared by all clients and threads in this process,
+    so that concurrent page fetching never exceeds max_inflight requests.
+    The first client in the process decides the size.
+
+    Returns:
+        threading.BoundedSemaphore -- semaphore for the host
+    """
+    key = (os.getpid(), self._host, self._port)
+    with _SESSIONS_LOCK:
+      semaphore = _INFLIGHT.get(key)
+      if semaphore is None:
+        semaphore = threading.BoundedSemaphore(self._max_inflight)
+        _INFLIGHT[key] = semaphore
+    return semaphore
+
+
+  def request_stats(self):
+    """Get counters of backoff and rate limit.
+
+    keys
+      'retries'                     number of requests retried due to 429/503
+      'retry_wait'                  seconds slept for backoff
+      'rate_limit_wait'             seconds slept for rate limiter
+      'token_refreshes'             number of tokens obtained from network
+      'token_background_refreshes'  number of tokens refreshed ahead of expiry
+      'replays'                     number of requests replayed after 401
+
+    Returns:
+        dict -- counters
+    """
+    return dict(self._request_stats)
+
+
+  def cache_stats(self):
+    """Get counters of the response cache.
+
+    keys
+      'hits'         number of GET answered from cache
+      'misses'       number of GET sent to the server
+      'revalidated'  number of stale cache confirmed by 304 Not Modified
+
+    Returns:
+        dict -- counters
+    """
+    return dict(self._cache_stats)
+
+
+  def update_params(self, params):
+    """Replace params of a client reused by the next task or loop item.
+
+    Only module specific params such as ip or sites are refreshed.
+    Common params in argument_spec are fixed at construction,
+    so the client must be reused only when they are the same.
+    Counters are reset so that the stats in the result belong to the task.
+
+    Arguments:
+        params {dict} -- module params
+
+    Returns:
+        DnacRestClient -- self
+    """
+    self.params = params
+    self._check_mode = params.get('check_mode', self._check_mode)
+    for stats in (self._request_stats, self._cache_stats):
+      for key, value in stats.items():
+        stats[key] = type(value)()
+    return self
+
+
+  def session_stats(self):
+    """Get connection reuse counters of the shared session.
+
+    keys
+      'requests'     number of requests sent via the pool
+      'connections'  number of connections newly established
+      'reused'       number of requests sent over existing connection
+
+    Returns:
+        dict -- counters
+    """
+    stats = {
+      'requests': 0,
+      'connections': 0,
+      'reused': 0
+    }
+
+    # no session means no request, do not create it only for the stats
+    key = (os.getpid(), self._host, self._port, self._pool_size, self._max_retries)
+    session = _SESSIONS.get(key)
+    if session is None:
+      return stats
+
+    for adapter in set(session.adapters.values()):
+      pools = adapter.poolmanager.pools
+      for pool_key in pools.keys():
+        pool = pools.get(pool_key)
+        if pool is None:
+          continue
+        stats['requests'] += pool.num_requests
+        stats['connections'] += pool.num_connections
+
+    stats['reused'] = max(stats['requests'] - stats['connections'], 0)
+    return stats
+
 
   def save_token(self, token):
-    """Save token string to file as pickle format.
+    """Save token string to the token store.
 
     dict
       key: URL + '.' + username
-      value: token string
+      value: dict
+        'token': token string
+        'exp': expiration date in epoch seconds
 
     Arguments:
-        token {string} -- token string
+        token {string} -- token string, remove it if empty
     """
 
     key = self._host + '.' + self._username
 
-    data = self.load_data()
+    # update memory cache shared in this process
+    self.remember_token(token)
 
-    if data:
-      if not token:
-        # remove it
-        self._token = ''
-        if key in data:
-          data.pop(key)
-      else:
-        # overwrite the token
-        data[key] = token
+    if not token:
+      self.token_store.remove(key)
     else:
-      # newly create
-      data = {}
-      data[key] = token
-
-    try:
-      with open(self.token_path, 'wb') as f:
-        pickle.dump(data, f)
-    except IOError as e:
-      logging.exception(e)
+      self.token_store.put(key, token, self.get_token_exp(token))
 
 
   def load_data(self):
-    """Restore cache data from pickle file.
+    """Restore cache data from the token store.
 
     Returns:
         dict or None -- cached data
     """
-    if not os.path.isfile(self.token_path):
-      return None
-
-    data = None
-    try:
-      with open(self.token_path, 'rb') as f:
-        data = pickle.load(f)
-    except IOError as e:
-      logging.exception(e)
-    except ValueError as e:
-      logging.exception(e)
-
-    return data
+    return self.token_store.load() or None
 
 
   def load_token(self):
@@ -272,57 +683,166 @@ class DnacRestClient:
     Returns:
         str or None -- token string
     """
-    data = self.load_data()
-    if not data:
-      return None
+    token, _ = self.load_token_entry()
+    return token
 
-    key = self._host + '.' + self._username
-    return data.get(key)
 
+  def load_token_entry(self):
+    """Load date from cache file and return token string and its expiration date.
 
-  def is_expired(self, token):
-    """return True if specified token is expired.
+    Returns:
+        tuple -- (token string, expiration date in epoch seconds), (None, None) if not found
     """
+    key = self._host + '.' + self._username
+    return self.token_store.get(key)
+
+
+  def get_token_exp(self, token):
+    """return expiration date of the token
+
+    Arguments:
+        token {str} -- JWT format token string
 
-    # now = datetime.datetime.utcnow()
-    now = datetime.datetime.now(datetime.timezone.utc)
+    Returns:
+        int or None -- 'exp' in the payload, epoch seconds
+    """
+    try:
+      payload = self.parse_jwt(token)
+    except (ValueError, IndexError, TypeError) as e:
+      logging.exception(e)
+      return None
 
-    payload = self.parse_jwt(token)
     if not payload:
-      return True
+      return None
 
     # 'exp' is the expiration date
-    expires_at_str = payload.get('exp')
-    if not expires_at_str:
-      return True
+    return payload.get('exp')
+
+
+  def is_expired(self, token, exp=None):
+    """return True if specified token is expired.
+
+    Arguments:
+        token {str} -- JWT format token string
 
-    # convert to datetime object
-    expires_at = datetime.datetime.fromtimestamp(expires_at_str, datetime.timezone.utc)
+    Keyword Arguments:
+        exp {int} -- expiration date of the token if already known (default: {None})
+    """
+
+    if exp is None:
+      exp = self.get_token_exp(token)
+    if not exp:
+      return True
 
     # in case of time difference, -5 min
-    expires_at -= datetime.timedelta(minutes=5)
+    expires_at = exp - 5 * 60
 
-    if now < expires_at:
+    if time.time() < expires_at:
       return False
 
     return True
 
 
+  def remember_token(self, token):
+    """Store token in memory cache shared by the clients in this process.
+
+    Arguments:
+        token {str} -- token string, empty to forget
+    """
+    key = (self._host, self._username)
+    with _TOKENS_LOCK:
+      if token:
+        _TOKENS[key] = (token, self.get_token_exp(token))
+      else:
+        _TOKENS.pop(key, None)
+    self._token = token or ''
+
+
+  def get_token_entry_from_memory(self):
+    """Get token from memory cache shared by the clients in this process.
+
+    Returns:
+        tuple -- (token, exp), (None, None) if not available
+    """
+    with _TOKENS_LOCK:
+      token, exp = _TOKENS.get((self._host, self._username), (None, None))
+
+    if not token or self.is_expired(token, exp=exp):
+      return None, None
+    return token, exp
+
+
+  def needs_refresh(self, exp):
+    """return True if the token should be refreshed ahead of expiry.
+
+    Arguments:
+        exp {int} -- expiration date in epoch seconds
+
+    Returns:
+        bool -- True if remaining lifetime is shorter than token_refresh_ahead
+    """
+    if not exp:
+      return True
+    return exp - time.time() < self._token_refresh_ahead
+
+
   def get_token(self):
     """get token thread safe
+
+    1. memory cache in this process, no lock
+    2. disk cache without lock, the token file is always replaced atomically
+    3. disk cache with exclusive lock, and then get new token from network
+
+    If the token is going to expire within token_refresh_ahead seconds,
+    new token is requested in background thread while the current one is returned.
+
+    The token of the persistent connection is used if connection is set.
     """
+    if self._connection is not None:
+      return self.get_token_from_connection()
+
     # memory cache
-    if self._token:
-      return self._token
+    token, exp = self.get_token_entry_from_memory()
+
+    if not token:
+      # disk cache
+      token = self.get_token_from_cache()
+
+      if not token:
+        with open(self.lock_path) as lock_file:
+          # block until lock file, another process might have refreshed the token while waiting
+          fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+          try:
+            token = self._get_token()
+          finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+      if not token:
+        return None
+
+      self.remember_token(token)
+      exp = self.get_token_exp(token)
+
+    self._token = token
+
+    if self.needs_refresh(exp):
+      self.start_background_refresh(token)
+
+    return token
 
-    with open(self.lock_path) as lock_file:
-      # block until lock file
-      fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
-      try:
-        token = self._get_token()
-      finally:
-        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
 
+  def get_token_from_connection(self):
+    """get token owned by the persistent connection
+
+    Returns:
+        str or None -- token string
+    """
+    try:
+      token = self._connection.get_token()
+    except Exception as e:  # pylint: disable=broad-except
+      logging.error("failed to get token from the persistent connection: %s", e)
+      return None
+    self._token = token
     return token
 
 
@@ -334,12 +854,23 @@ class DnacRestClient:
     if token:
       return token
 
+    return self.get_new_token()
+
+
+  def get_new_token(self):
+    """get new token from network and save it
+
+    Call this with exclusive lock of lock_path.
+
+    Returns:
+        str or None -- token string
+    """
     logging.info('trying to get new token from api endpoint')
 
     result = self.get_token_from_network()
 
     if result.get('failed'):
-      message = result.get('message')
+      message = result.get('msg')
       logging.info(message)
       return None
 
@@ -347,22 +878,79 @@ class DnacRestClient:
 
     self.save_token(token)
 
+    self._request_stats['token_refreshes'] += 1
+
+    return token
+
+
+  def refresh_token(self, stale_token=None):
+    """get new token in place of stale_token
+
+    If another process has already refreshed the token, use it.
+
+    Keyword Arguments:
+        stale_token {str} -- token to be replaced (default: {None})
+
+    Returns:
+        str or None -- token string
+    """
+    # httpapi plugin logs in again by itself
+    if self._connection is not None:
+      return None
+
+    with open(self.lock_path) as lock_file:
+      fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+      try:
+        token, exp = self.load_token_entry()
+        if token and token != stale_token and not self.needs_refresh(exp):
+          logging.info("token has already been refreshed by another process")
+          self.remember_token(token)
+        else:
+          token = self.get_new_token()
+      finally:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
     return token
 
 
+  def start_background_refresh(self, stale_token):
+    """refresh token in daemon thread, only one thread per host and user in this process
+
+    Arguments:
+        stale_token {str} -- token to be replaced
+    """
+    key = (self._host, self._username)
+    with _TOKENS_LOCK:
+      if key in _REFRESHING:
+        return
+      _REFRESHING.add(key)
+
+    def _refresh():
+      try:
+        if self.refresh_token(stale_token=stale_token):
+          self._request_stats['token_background_refreshes'] += 1
+      finally:
+        with _TOKENS_LOCK:
+          _REFRESHING.discard(key)
+
+    logging.info("token expires soon, refreshing in background")
+    thread = threading.Thread(target=_refresh, name='dnac-token-refresh', daemon=True)
+    thread.start()
+
+
   def get_token_from_cache(self):
     """get token from cache file.
 
     Returns:
         str or None -- tonen string if cache is available
     """
-    token = self.load_token()
+    token, exp = self.load_token_entry()
 
     if not token:
       logging.info("There is no token on disk cache")
       return None
 
-    if self.is_expired(token):
+    if self.is_expired(token, exp=exp):
       logging.info("Found token on disk cache but expired")
       return None
 
@@ -389,6 +977,9 @@ class DnacRestClient:
       'Content-Type': "application/json"
     }
 
+    if not self._keepalive:
+      headers['Connection'] = "close"
+
     auth = (self._username, self._password)
 
     api_path = self._normalize_api_path(self.API_PATH_TOKEN)
@@ -404,9 +995,11 @@ class DnacRestClient:
 
     logging.info("POST %s", url)
 
+    load_requests()
+
     r = None
     try:
-      r = requests.post(url, timeout=timeout, proxies=proxies, headers=headers, auth=auth, verify=False)
+      r = self.session().post(url, timeout=timeout, proxies=proxies, headers=headers, auth=auth, verify=False)
     except requests.exceptions.ProxyError:
       result['msg'] = 'requests.exceptions.ProxyError occured'
     except requests.exceptions.SSLError:
@@ -476,10 +1069,12 @@ class DnacRestClient:
         dict -- token decoded as json format
     """
 
-    if HAS_JWT:
+    if load_jwt():
       # if PyJWT is installed
       payload = jwt.decode(token, verify=False)
     else:
+      # decode jwt by hand
+      import base64  # pylint: disable=import-outside-toplevel
       tmp = token.split('.')
       payload = tmp[1]
 
@@ -491,7 +1086,7 @@ class DnacRestClient:
     return payload
 
 
-  def set_token():
+  def set_token(invalidate_cache=False):
     """decorator for GET/POST/PUT/DELETE operation
 
     keys
@@ -499,6 +1094,15 @@ class DnacRestClient:
       'status_code'
       'data'
       'Content-Type'
+      'etag'
+      'last_modified'
+      'response' (only if stream=True is given and succeeded)
+
+    With stream=True the body of successful response is not read,
+    the caller reads it from result['response'] and closes it.
+
+    Keyword Arguments:
+        invalidate_cache {bool} -- clear the response cache if the request succeeded (default: {False})
 
     Returns:
         dict -- result of requests GET/POST/PUT/DELETE operation
@@ -536,32 +1140,42 @@ class DnacRestClient:
         if self.runsync() is True:
           headers.update({'__runsync': "true"})
 
+        if self.keepalive() is not True:
+          headers.update({'Connection': "close"})
+
+        # conditional request headers
+        headers.update(kwargs.pop('extra_headers', None) or {})
+
         timeout = self.timeout()
         proxies = self.proxies()
 
         #
         # PROCESS
         #
+        if self._connection is None or kwargs.get('stream'):
+          load_requests()
+
+        # requests is not imported when sent via the persistent connection, its errors are caught only when loaded,
+        # otherwise the except clause itself raises AttributeError and hides the real error
+        request_errors = (requests.exceptions.RequestException,) if requests is not None else ()
+
         r = None
         try:
-          r = wrapped_function(self, *args, headers=headers, timeout=timeout, proxies=proxies, verify=False, **kwargs)
-        except requests.exceptions.ProxyError as e:
-          result['msg'] = "requests.exceptions.ProxyError occured"
-          result['original_message'] = str(e)
-        except requests.exceptions.SSLError as e:
-          result['msg'] = "requests.exceptions.SSLError occured"
-          result['original_message'] = str(e)
-        except requests.exceptions.ConnectionError as e:
-          result['msg'] = "requests.exceptions.ConnectionError occured"
-          result['original_message'] = str(e)
-        except requests.exceptions.HTTPError as e:
-          result['msg'] = "requests.exceptions.HTTPError occured"
-          result['original_message'] = str(e)
-        except requests.exceptions.ReadTimeout as e:
-          result['msg'] = "requests.exceptions.ReadTimeout occured"
-          result['original_message'] = str(e)
-        except requests.exceptions.RequestException as e:
-          result['msg'] = "requests.exceptions.RequestException occured"
+          send_function = functools.partial(
+            wrapped_function, self, *args, headers=headers, timeout=timeout, proxies=proxies, verify=False, **kwargs)
+          r = self.send_with_backoff(send_function)
+
+          # the token might be revoked in the middle of long job, replay once with new token
+          if r is not None and r.status_code == 401:
+            new_token = self.refresh_token(stale_token=token)
+            if new_token:
+              logging.info("%s %s, replaying with new token", r.status_code, r.url)
+              headers['x-auth-token'] = new_token
+              self._request_stats['replays'] += 1
+              r = self.send_with_backoff(send_function)
+        except request_errors as e:
+          # ProxyError, SSLError, ConnectionError, HTTPError, ReadTimeout and so on
+          result['msg'] = "requests.exceptions.{} occured".format(type(e).__name__)
           result['original_message'] = str(e)
 
         #
@@ -576,6 +1190,12 @@ class DnacRestClient:
         result['status_code'] = r.status_code
         logging.info("%s %s", r.status_code, r.url)
 
+        # leave the body to the caller
+        if kwargs.get('stream') and r.ok:
+          result['failed'] = False
+          result['response'] = r
+          return result
+
         # extract data from response
         content_type = r.headers.get('Content-Type', '')
         if content_type.find("json") >= 0:
@@ -584,14 +1204,22 @@ class DnacRestClient:
           # in case of error ?
           result['text'] = r.text
 
+        # validators for conditional request
+        if r.headers.get('ETag'):
+          result['etag'] = r.headers.get('ETag')
+        if r.headers.get('Last-Modified'):
+          result['last_modified'] = r.headers.get('Last-Modified')
+
         if r.ok:
           # success
           result['failed'] = False
+          if invalidate_cache and self._response_cache is not None:
+            self._response_cache.clear()
         else:
           logger.info(json.dumps(result, ensure_ascii=False, indent=2))
 
           # remove token cache if authentication error
-          if r.status_code == 401:
+          if r.status_code == 401 and self._connection is None:
             self.save_token(None)
             result['msg'] = "cached token is removed due to authentication error"
 
@@ -602,9 +1230,110 @@ class DnacRestClient:
   #
 
 
-  @staticmethod
-  def _normalize_api_path(api_path):
-    return api_path.strip('/')
+  def send_with_backoff(self, send_function):
+    """Send request with rate limit and retry on 429/503.
+
+    Arguments:
+        send_function {callable} -- function which sends request and returns requests.Response
+
+    Returns:
+        requests.Response or None -- the last response
+    """
+    attempt = 0
+    while True:
+      if self._rate_limiter is not None:
+        self._request_stats['rate_limit_wait'] += self._rate_limiter.acquire()
+
+      with self.inflight():
+        r = send_function()
+
+      if r is None or r.status_code not in self.RETRY_STATUS_CODES or attempt >= self._backoff_retries:
+        return r
+
+      delay = self.backoff_delay(attempt, r.headers.get('Retry-After'))
+      logging.info("%s %s, retrying in %.2f seconds...", r.status_code, r.url, delay)
+      self._request_stats['retries'] += 1
+      self._request_stats['retry_wait'] += delay
+      time.sleep(delay)
+      attempt += 1
+
+
+  def backoff_delay(self, attempt, retry_after=None):
+    """Calculate seconds to wait before retry.
+
+    Retry-After header is honored if the server sent it,
+    otherwise exponential backoff with full jitter is used.
+    In both cases the delay is limited to backoff_max.
+
+    Arguments:
+        attempt {int} -- number of retries already done
+
+    Keyword Arguments:
+        retry_after {str} -- value of Retry-After header (default: {None})
+
+    Returns:
+        float -- seconds to wait
+    """
+    delay = self.parse_retry_after(retry_after)
+    if delay is None:
+      delay = random.uniform(0, self._backoff_factor * (2 ** attempt))
+    else:
+      # spread retries of the processes which received the same Retry-After
+      delay += random.uniform(0, self._backoff_factor)
+    return min(delay, self._backoff_max)
+
+
+  @staticmethod
+  def parse_retry_after(value):
+    """Parse Retry-After header, delay-seconds or HTTP-date.
+
+    Arguments:
+        value {str} -- value of Retry-After header
+
+    Returns:
+        float or None -- seconds to wait, None if not available
+    """
+    if not value:
+      return None
+
+    try:
+      return max(float(value), 0.0)
+    except ValueError:
+      pass
+
+    # HTTP-date, rarely used by dna center
+    import email.utils  # pylint: disable=import-outside-toplevel
+    try:
+      retry_at = email.utils.parsedate_tz(value)
+    except (TypeError, ValueError):
+      return None
+    if retry_at is None:
+      return None
+    return max(email.utils.mktime_tz(retry_at) - time.time(), 0.0)
+
+
+  @staticmethod
+  def print_table(table, headers=(), tablefmt='simple'):
+    """Print table with tabulate module, which is imported on first use
+
+    Arguments:
+        table {list} -- list of rows
+
+    Keyword Arguments:
+        headers {list} -- column names (default: {()})
+        tablefmt {str} -- format of tabulate (default: {'simple'})
+    """
+    try:
+      import tabulate  # pylint: disable=import-outside-toplevel
+    except ImportError:
+      print("tabulate module not found.")
+      return
+    print(tabulate.tabulate(table, headers, tablefmt=tablefmt))
+
+
+  @staticmethod
+  def _normalize_api_path(api_path):
+    return api_path.strip('/')
 
 
   @staticmethod
@@ -618,108 +1347,570 @@ class DnacRestClient:
     return None
 
 
-  @set_token()
   def get(self, api_path='', params=None, **kwargs):
-    """requests.get() wrapped with set_token() decorator
+    """GET with the response cache
+
+    If ttl of the api_path is more than 0, the result is stored in the cache.
+    Fresh cache is returned without request.
+    Stale cache is revalidated with If-None-Match/If-Modified-Since
+    if the server sent ETag/Last-Modified.
+    Streamed request (stream=True) bypasses the cache.
+
+    Keyword Arguments:
+        api_path {str} -- api path (default: {''})
+        params {dict} -- query parameters (default: {None})
+
+    Returns:
+        dict -- result of set_token() decorator
+    """
+    ttl = self.cache_ttl_for(api_path)
+    if not ttl or self._response_cache is None or kwargs.get('stream'):
+      return self._get(api_path=api_path, params=params, **kwargs)
+
+    key = self._response_cache.make_key(self._host, self._port, self._username, self._normalize_api_path(api_path), params)
+    entry = self._response_cache.get(key)
+    if entry and entry.get('stored', 0) + ttl > time.time():
+      self._cache_stats['hits'] += 1
+      return entry.get('result')
+
+    extra_headers = {}
+    if entry and entry.get('etag'):
+      extra_headers['If-None-Match'] = entry.get('etag')
+    if entry and entry.get('last_modified'):
+      extra_headers['If-Modified-Since'] = entry.get('last_modified')
+
+    get_result = self._get(api_path=api_path, params=params, extra_headers=extra_headers, **kwargs)
+
+    if entry and get_result and get_result.get('status_code') == 304:
+      self._cache_stats['revalidated'] += 1
+      self._response_cache.put(key, entry.get('result'), etag=entry.get('etag'), last_modified=entry.get('last_modified'))
+      return entry.get('result')
+
+    self._cache_stats['misses'] += 1
+    if get_result and not get_result.get('failed'):
+      self._response_cache.put(key, get_result, etag=get_result.get('etag'), last_modified=get_result.get('last_modified'))
+
+    return get_result
+
+
+  def cache_ttl_for(self, api_path):
+    """Get ttl of the api_path, the longest prefix in cache_ttl_by_path wins.
+
+    Arguments:
+        api_path {str} -- api path
+
+    Returns:
+        int -- ttl in seconds, 0 means no cache
+    """
+    path = '/' + self._normalize_api_path(api_path or '')
+    matched = [prefix for prefix in self._cache_ttl_by_path if path.startswith('/' + self._normalize_api_path(prefix))]
+    if matched:
+      return self._cache_ttl_by_path[max(matched, key=len)] or 0
+    return self._cache_ttl
+
+
+  def cached_result(self, api_path, params=None):
+    """Get fresh result of GET from the response cache.
+
+    Arguments:
+        api_path {str} -- api path
+
+    Keyword Arguments:
+        params {dict or list} -- query parameters (default: {None})
+
+    Returns:
+        dict or None -- result of set_token() decorator, None if not cached or stale
+    """
+    ttl = self.cache_ttl_for(api_path)
+    if not ttl or self._response_cache is None:
+      return None
+
+    key = self._response_cache.make_key(self._host, self._port, self._username, self._normalize_api_path(api_path), params)
+    entry = self._response_cache.get(key)
+    if entry and entry.get('stored', 0) + ttl > time.time():
+      self._cache_stats['hits'] += 1
+      return entry.get('result')
+    return None
+
+
+  def store_result(self, api_path, params, get_result):
+    """Store result of GET to the response cache if ttl of the api_path is more than 0.
+
+    Arguments:
+        api_path {str} -- api path
+        params {dict or list} -- query parameters
+        get_result {dict} -- result of set_token() decorator
+    """
+    ttl = self.cache_ttl_for(api_path)
+    if not ttl or self._response_cache is None:
+      return
+
+    self._cache_stats['misses'] += 1
+    if get_result and not get_result.get('failed'):
+      key = self._response_cache.make_key(self._host, self._port, self._username, self._normalize_api_path(api_path), params)
+      self._response_cache.put(key, get_result, etag=get_result.get('etag'), last_modified=get_result.get('last_modified'))
+
+
+  @staticmethod
+  def split_request(item):
+    """split item of get_many() into api_path and params
+
+    Arguments:
+        item {str or tuple} -- api_path or (api_path, params)
+
+    Returns:
+        tuple -- (api_path, params)
+    """
+    if isinstance(item, (list, tuple)):
+      return item[0], item[1] if len(item) > 1 else None
+    return item, None
+
+
+  def get_many(self, api_paths):
+    """GET many api paths concurrently
+
+    Fresh results in the response cache are used as they are.
+    The rest are sent by asyncio if aiohttp is installed,
+    otherwise, or via the persistent connection, by threads.
+    Either way the rate limiter and max_inflight apply.
+
+      results = drc.get_many([
+        '/dna/intent/api/v1/interface/network-device/{}'.format(device_id),
+        ('/dna/intent/api/v1/network-device', {'family': 'Switches and Hubs'}),
+      ])
+
+    Arguments:
+        api_paths {list} -- list of api_path or tuple of (api_path, params)
+
+    Returns:
+        list -- list of result in the same order as api_paths
+    """
+    requests_list = [self.split_request(item) for item in api_paths]
+    results = [self.cached_result(api_path, params) for api_path, params in requests_list]
+    pending = [i for i, get_result in enumerate(results) if get_result is None]
+    if not pending:
+      return results
+
+    try:
+      from dnac_async_client import HAS_AIOHTTP, DnacAsyncGetter  # pylint: disable=import-outside-toplevel
+    except ImportError:
+      from ansible_collections.iida.dnac.plugins.module_utils.dnac_async_client import HAS_AIOHTTP, DnacAsyncGetter  # pylint: disable=import-outside-toplevel
+
+    if HAS_AIOHTTP and self._connection is None:
+      logging.info('sending %s GET with asyncio', len(pending))
+      fetched = DnacAsyncGetter(self).get_many([requests_list[i] for i in pending])
+    else:
+      # get token in advance, threads share it
+      self.get_token()
+      workers = max(min(self._max_inflight, len(pending)), 1)
+      logging.info('sending %s GET with %s threads', len(pending), workers)
+      with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        fetched = list(executor.map(lambda i: self._get(api_path=requests_list[i][0], params=requests_list[i][1]), pending))
+
+    for i, get_result in zip(pending, fetched):
+      self.store_result(requests_list[i][0], requests_list[i][1], get_result)
+      results[i] = get_result
+
+    return results
+
+
+  @set_token()
+  def _get(self, api_path='', params=None, **kwargs):
+    """session.get() wrapped with set_token() decorator
+
+    Streamed GET (stream=True) is sent by the session with the token of the persistent connection,
+    because the persistent connection returns the whole body at once.
     """
     if not api_path:
       return None
 
     api_path = self._normalize_api_path(api_path)
+    if self._connection is not None and not kwargs.get('stream'):
+      return self.send_via_connection('GET', api_path, params=params, **kwargs)
+
     url = 'https://{}:{}/{}'.format(self._host, self._port, api_path)
 
     logging.info("GET %s", url)
-    return requests.get(url, params=params, **kwargs)
+    return self.session().get(url, params=params, **kwargs)
 
 
-  @set_token()
+  @set_token(invalidate_cache=True)
   def post(self, api_path='', data='', **kwargs):
-    """requests.post() wrapped with set_token() decorator
+    """session.post() wrapped with set_token() decorator
     """
     if not api_path:
       return None
 
     api_path = self._normalize_api_path(api_path)
+    if self._connection is not None:
+      return self.send_via_connection('POST', api_path, data=data, **kwargs)
+
     url = 'https://{}:{}/{}'.format(self._host, self._port, api_path)
 
     logging.info("POST %s", url)
-    return requests.post(url, json.dumps(data), **kwargs)
+    return self.session().post(url, json.dumps(data), **kwargs)
 
 
-  @set_token()
+  @set_token(invalidate_cache=True)
   def put(self, api_path='', data='', **kwargs):
-    """requests.put() wrapped with set_token() decorator
+    """session.put() wrapped with set_token() decorator
     """
     if not api_path:
       return None
 
     api_path = self._normalize_api_path(api_path)
+    if self._connection is not None:
+      return self.send_via_connection('PUT', api_path, data=data, **kwargs)
+
     url = 'https://{}:{}/{}'.format(self._host, self._port, api_path)
 
     logging.info("PUT %s", url)
-    return requests.put(url, json.dumps(data), **kwargs)
+    return self.session().put(url, json.dumps(data), **kwargs)
 
 
-  @set_token()
+  @set_token(invalidate_cache=True)
   def delete(self, api_path='', **kwargs):
-    """requests.delete() wrapped with set_token() decorator
+    """session.delete() wrapped with set_token() decorator
     """
     if not api_path:
       return None
 
     api_path = self._normalize_api_path(api_path)
+    if self._connection is not None:
+      return self.send_via_connection('DELETE', api_path, **kwargs)
+
     url = 'https://{}:{}/{}'.format(self._host, self._port, api_path)
 
     logging.info("DELETE %s", url)
-    return requests.delete(url, **kwargs)
+    return self.session().delete(url, **kwargs)
+
+
+  def send_via_connection(self, method, api_path, params=None, data=None, headers=None, **_):
+    """send request via the persistent connection of httpapi plugin
+
+    timeout, proxies and verify are options of the connection, they are ignored here.
+
+    Arguments:
+        method {str} -- http method
+        api_path {str} -- api path
+
+    Keyword Arguments:
+        params {dict or list} -- query parameters (default: {None})
+        data {object} -- request body (default: {None})
+        headers {dict} -- request headers (default: {None})
+
+    Returns:
+        DnacConnectionResponse -- requests.Response like object
+    """
+    # ansible is always there when the connection is set
+    from ansible.module_utils.connection import ConnectionError as AnsibleConnectionError  # pylint: disable=import-outside-toplevel
+
+    # the token and keepalive are handled by the plugin
+    headers = {k: v for k, v in (headers or {}).items() if k.lower() not in ('x-auth-token', 'connection')}
+
+    # list of tuples becomes list of lists over json-rpc, so encode it here
+    if params:
+      api_path += ('&' if '?' in api_path else '?') + urlencode(params, doseq=True)
+
+    logging.info("%s %s via persistent connection", method, api_path)
+    try:
+      response = self._connection.send_request(api_path, method=method, data=data, headers=headers)
+    except (AnsibleConnectionError, OSError) as e:
+      logging.error("persistent connection error: %s", e)
+      response = {'status_code': -1, 'url': api_path, 'headers': {}, 'text': str(e)}
+
+    return DnacConnectionResponse(response)
+
+
+  def paginate(self, api_path, params=None, page_size=None, fields=None):
+    """Iterate over all records of offset/limit paged api.
+
+    Records are yielded one by one while pages are fetched on demand.
+    Check failed attribute of the returned object after iteration
+    to know whether all pages are fetched or not.
+
+      pager = drc.paginate('/dna/intent/api/v1/network-device')
+      for device in pager:
+        ...
+      if pager.failed:
+        ...
+
+    Arguments:
+        api_path {str} -- api path which accepts offset and limit
+
+    Keyword Arguments:
+        params {dict} -- query parameters (default: {None})
+        page_size {int} -- limit of a page, page_size argument is used if not specified (default: {None})
+        fields {list} -- keys to be kept in each record, see project_fields() (default: {None})
+
+    Returns:
+        DnacPager -- iterable object of records
+    """
+    page_size = min(page_size or self._page_size, self.MAX_PAGE_SIZE)
+    return DnacPager(self, api_path, params=params, page_size=page_size, fields=fields)
+
+
+  @staticmethod
+  def project_fields(record, fields):
+    """Trim the record to the fields
+
+    'id' is always kept since it is the key of the record.
+
+    Arguments:
+        record {dict} -- record object
+        fields {list} -- keys to be kept, no projection if empty
+
+    Returns:
+        dict -- trimmed record
+    """
+    if not fields or not isinstance(record, dict):
+      return record
+    return {key: record.get(key) for key in ['id'] + [f for f in fields if f != 'id'] if key in record}
+
+
+  def fetch_pages(self, api_path, params=None, count_path=None, page_size=None, fields=None, into=None):
+    """Get all records of offset/limit paged api.
+
+    If workers is more than 1 and count_path is given,
+    the number of records is asked to count_path first,
+    and then page windows are fetched concurrently by thread pool.
+    Pages are reassembled in order of offset, and at most workers pages are fetched ahead of it.
+    Otherwise pages are fetched serially.
+
+    Keep pool_size equal or larger than workers to reuse connections.
+
+    Arguments:
+        api_path {str} -- api path which accepts offset and limit
+
+    Keyword Arguments:
+        params {dict} -- query parameters (default: {None})
+        count_path {str} -- api path which returns the number of records (default: {None})
+        page_size {int} -- limit of a page (default: {None})
+        fields {list} -- keys to be kept in each record (default: {None})
+        into {object} -- container which has extend(), ex CompactTable (default: {new list})
+
+    Returns:
+        list or None -- list of all records or into, None if failed
+    """
+    records = [] if into is None else into
+
+    pager = self.paginate(api_path, params=params, page_size=page_size, fields=fields)
+
+    count = None
+    if self._workers > 1 and count_path:
+      get_result = self.get(api_path=count_path)
+      count = self.extract_data_response(get_result)
+      if not isinstance(count, int):
+        logging.warning('failed to get count from %s, fall back to serial fetch', count_path)
+        count = None
+
+    if count is None:
+      records.extend(pager)
+      if pager.failed:
+        return None
+      return records
+
+    offsets = list(range(self.PAGE_OFFSET_BASE, self.PAGE_OFFSET_BASE + count, pager.page_size))
+    if not offsets:
+      return records
+
+    # get token in advance, workers share it
+    if not self.get_token():
+      return None
+
+    workers = min(self._workers, len(offsets))
+    logging.info('fetching %s pages of %s with %s workers', len(offsets), api_path, workers)
+    last_page = None
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+      # at most workers pages are submitted ahead, so the pages on memory are bounded by workers,
+      # pages are consumed in order of offset, each page is released after extend
+      pending = iter(offsets)
+      window = collections.deque(executor.submit(pager.get_page, offset) for offset in itertools.islice(pending, workers))
+      while window:
+        page = window.popleft().result()
+        if page is None:
+          for future in window:
+            future.cancel()
+          return None
+        records.extend(page)
+        last_page = page
+        offset = next(pending, None)
+        if offset is not None:
+          window.append(executor.submit(pager.get_page, offset))
+
+    # records might be added after counting
+    offset = offsets[-1]
+    while len(last_page) == pager.page_size:
+      offset += pager.page_size
+      last_page = pager.get_page(offset)
+      if last_page is None:
+        return None
+      records.extend(last_page)
+
+    return records
 
 
   def wait_for_task(self, task_id):
     """wait for completion of specified task_id
+
+    Arguments:
+        task_id {str} -- task id returned with 202 Accepted
+
+    Returns:
+        dict -- result of the last GET of the task, 'elapsed' and 'polls' are added
     """
-    timeout = self.RETRY_INTERVAL * self.MAX_RETRY_COUNT
-    interval = self.RETRY_INTERVAL
+    return self.wait_for_tasks([task_id]).get(task_id)
 
-    api_path = '/dna/intent/api/v1/task/{}'.format(task_id)
 
-    result = {
-      'failed': True,
-      'msg': ''
-    }
+  def wait_for_tasks(self, task_ids, timeout=None):
+    """wait for completion of many tasks at once
 
-    start_time = time.time()
+    Tasks are polled concurrently, up to max_inflight threads regardless of workers.
+    Polling interval of each task starts from task_poll_interval
+    and grows by TASK_POLL_BACKOFF up to task_poll_max_interval,
+    so short tasks finish quickly and long tasks do not flood the controller.
+    The task api accepts only one task id, so the tasks which are due
+    in the same round are polled together.
 
-    while True:
-      get_result = self.get(api_path=api_path)
-      if not get_result:
-        result['msg'] = 'failed before requests.get()'
-        break
+    Arguments:
+        task_ids {list} -- list of task id
 
-      data = get_result.get('data', {})
-      response = data.get('response')
-      # print(json.dumps(response, ensure_ascii=False, indent=2))
+    Keyword Arguments:
+        timeout {int} -- overall deadline in sec, task_timeout argument is used if not specified (default: {None})
 
-      if 'endTime' in response:
-        result.update(get_result)
-        result['failed'] = False
+    Returns:
+        dict -- key is task id, value is the result of the task
+          'failed'       True if the task is error or did not end
+          'pending'      True if the task did not end within the timeout
+          'msg'          message
+          'status_code'  status code of the last GET
+          'data'         data of the last GET
+          'elapsed'      seconds until the end of the task
+          'polls'        number of GET
+    """
+    timeout = timeout or self._task_timeout
+    start_time = time.time()
+    deadline = start_time + timeout
+
+    results = {}
+    pending = {}
+    for task_id in task_ids:
+      if task_id in results or task_id in pending:
+        continue
+      if not task_id:
+        results[task_id] = {'failed': True, 'msg': 'task_id is empty', 'elapsed': 0, 'polls': 0}
+        continue
+      pending[task_id] = {'next_poll': start_time, 'interval': self._task_poll_interval, 'polls': 0}
+
+    while pending:
+      now = time.time()
+      due = [task_id for task_id, state in pending.items() if state['next_poll'] <= now]
+
+      if due:
+        # task polls are light, so they are not limited by workers which defaults to serial
+        workers = max(min(self._max_inflight, len(due)), 1)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+          polled = list(executor.map(self.check_task, due))
+
+        now = time.time()
+        for task_id, task_result in zip(due, polled):
+          state = pending[task_id]
+          state['polls'] += 1
+          if task_result is not None:
+            task_result['elapsed'] = round(now - start_time, 3)
+            task_result['polls'] = state['polls']
+            results[task_id] = task_result
+            del pending[task_id]
+            continue
+          state['interval'] = min(state['interval'] * self.TASK_POLL_BACKOFF, self._task_poll_max_interval)
+          state['next_poll'] = now + state['interval']
+
+      if not pending:
         break
 
-      if start_time + timeout < time.time():
-        result.update(get_result)
-        result['failed'] = True
-        result['msg'] = "task_id {} did not end within the specified timeout ({} sec)".format(task_id, timeout)
+      if now >= deadline:
+        for task_id, state in pending.items():
+          results[task_id] = {
+            'failed': True,
+            'msg': "task_id {} did not end within the specified timeout ({} sec)".format(task_id, timeout),
+            'pending': True,
+            'elapsed': round(now - start_time, 3),
+            'polls': state['polls']
+          }
         break
 
-      if response.get('isError') is True:
-        result.update(get_result)
-        result['failed'] = True
-        result['msg'] = "task_id {} is error".format(task_id)
-        break
+      next_poll = min(state['next_poll'] for state in pending.values())
+      sleep = max(min(next_poll, deadline) - time.time(), 0)
+      logging.info("%s tasks have not completed yet. Sleeping %.2f seconds...", len(pending), sleep)
+      time.sleep(sleep)
 
-      logging.info("task_id %s has not completed yet. Sleeping %s seconds...", task_id, interval)
-      time.sleep(interval)
+    return results
 
-    return result
+
+  def check_task(self, task_id):
+    """GET the task once
+
+    Arguments:
+        task_id {str} -- task id
+
+    Returns:
+        dict or None -- result if the task is ended or failed, None if still running
+    """
+    api_path = '/dna/intent/api/v1/task/{}'.format(task_id)
+
+    get_result = self.get(api_path=api_path)
+    if not get_result:
+      return {'failed': True, 'msg': 'failed before requests.get()'}
+
+    result = dict(get_result)
+
+    response = self.extract_data_response(get_result)
+    if get_result.get('failed') or not isinstance(response, dict):
+      result['failed'] = True
+      result['msg'] = result.get('msg') or "failed to get task_id {}".format(task_id)
+      return result
+
+    if response.get('isError') is True:
+      result['failed'] = True
+      result['msg'] = "task_id {} is error".format(task_id)
+      return result
+
+    if 'endTime' in response:
+      result['failed'] = False
+      return result
+
+    logging.info("task_id %s has not completed yet", task_id)
+    return None
+
+
+  def wait_or_journal_task(self, task_id, method, api_path):
+    """wait for the task, or record it in the journal if task_wait is False
+
+    Arguments:
+        task_id {str} -- task id returned with 202 Accepted
+        method {str} -- http method which spawned the task
+        api_path {str} -- api path which spawned the task
+
+    Returns:
+        dict -- result of the task, or submitted task_id
+    """
+    if self._task_wait:
+      return self.wait_for_task(task_id)
+
+    self.task_journal.append({
+      'task_id': task_id,
+      'host': self._host,
+      'username': self._username,
+      'method': method,
+      'api_path': api_path,
+      'submitted': time.time()
+    })
+
+    return {
+      'failed': False,
+      'task_id': task_id,
+      'msg': "task is submitted, collect the result by iida.dnac.task_status module"
+    }
 
 
   def create_object(self, api_path='', data=None):
@@ -773,7 +1964,7 @@ class DnacRestClient:
       # successfully ended but async operation is needed
       response = data.get('response')
       task_id = response.get('taskId')
-      wait_result = self.wait_for_task(task_id)
+      wait_result = self.wait_or_journal_task(task_id, 'POST', api_path)
       result.update(wait_result)
       result['changed'] = not wait_result.get('failed')
     else:
@@ -813,7 +2004,7 @@ class DnacRestClient:
       # successfully ended but async operation is needed
       response = data.get('response')
       task_id = response.get('taskId')
-      wait_result = self.wait_for_task(task_id)
+      wait_result = self.wait_or_journal_task(task_id, 'DELETE', api_path)
       result.update(wait_result)
       result['changed'] = not wait_result.get('failed')
     else:
@@ -899,9 +2090,191 @@ class DnacRestClient:
     else:
       result['failed'] = True
 
+    result['session_stats'] = self.session_stats()
+    result['request_stats'] = self.request_stats()
+    result['cache_stats'] = self.cache_stats()
+
     return result
 
 
+  def execute_module_task_status(self, check_mode=False):
+    """execute ansible module
+
+    Collect the result of the tasks recorded in the journal by task_wait=False.
+    Ended tasks are removed from the journal, pending tasks are kept.
+
+    Keyword Arguments:
+        check_mode {bool} -- Check mode or not (default: {False})
+
+    Returns:
+        dict -- Object of the result
+    """
+    result = {
+      'changed': False,
+      'failed': False
+    }
+
+    if check_mode:
+      result['warnings'] = "Get task status operation is not restricted by check_mode"
+
+    task_ids = self.params.get('task_ids')
+    if not task_ids:
+      task_ids = [entry.get('task_id') for entry in self.task_journal.load(host=self._host, username=self._username)]
+
+    tasks = self.wait_for_tasks(task_ids) if task_ids else {}
+
+    ended = [task_id for task_id, task in tasks.items() if not task.get('pending')]
+    if self.params.get('purge', True) and not check_mode:
+      self.task_journal.remove(ended)
+
+    result['tasks'] = tasks
+    result['pending'] = [task_id for task_id, task in tasks.items() if task.get('pending')]
+    result['failed'] = any(tasks[task_id].get('failed') for task_id in ended)
+
+    result['session_stats'] = self.session_stats()
+    result['request_stats'] = self.request_stats()
+    result['cache_stats'] = self.cache_stats()
+
+    return result
+
+
+
+class DnacConnectionHeaders(dict):
+  """Case insensitive dict of response headers
+  """
+
+  def __init__(self, headers=None):
+    super().__init__((k.lower(), v) for k, v in (headers or {}).items())
+
+
+  def get(self, key, default=None):
+    return super().get(key.lower(), default)
+
+
+  def __getitem__(self, key):
+    return super().__getitem__(key.lower())
+
+
+  def __contains__(self, key):
+    return super().__contains__(key.lower())
+
+
+
+class DnacConnectionResponse:
+  """requests.Response like object made from the result of httpapi send_request()
+
+  It has the attributes used by set_token() decorator.
+  """
+
+  def __init__(self, response):
+    """constructor for DnacConnectionResponse class
+
+    Arguments:
+        response {dict} -- status_code, url, headers and text
+    """
+    self.status_code = response.get('status_code', -1)
+    self.url = response.get('url', '')
+    self.text = response.get('text') or ''
+    self.headers = DnacConnectionHeaders(response.get('headers'))
+
+
+  @property
+  def ok(self):
+    return 200 <= self.status_code < 400
+
+
+  def json(self):
+    return json.loads(self.text)
+
+
+  def iter_content(self, chunk_size=1):
+    # the body is already on memory, DnacRestClient._get() does not stream via the connection
+    data = self.text.encode('UTF-8')
+    for i in range(0, len(data), chunk_size):
+      yield data[i:i + chunk_size]
+
+
+  def close(self):
+    pass
+
+
+
+class DnacPager:
+  """Iterable records of offset/limit paged api.
+
+  Generated by DnacRestClient.paginate()
+  """
+
+  def __init__(self, drc, api_path, params=None, page_size=DnacRestClient.DEFAULT_PAGE_SIZE, fields=None):
+    """constructor for DnacPager class
+
+    Arguments:
+        drc {DnacRestClient} -- client object
+        api_path {str} -- api path which accepts offset and limit
+
+    Keyword Arguments:
+        params {dict or list} -- query parameters except offset and limit (default: {None})
+        page_size {int} -- limit of a page (default: {500})
+        fields {list} -- keys to be kept in each record (default: {None})
+    """
+    self.drc = drc
+    self.api_path = api_path
+    if isinstance(params, dict):
+      params = list(params.items())
+    self.params = list(params or [])
+    self.page_size = page_size
+    self.fields = fields
+
+    # status of iteration
+    self.pages = 0
+    self.records = 0
+    self.failed = False
+    self.msg = ''
+
+
+  def __iter__(self):
+    offset = self.drc.PAGE_OFFSET_BASE
+    while True:
+      records = self.get_page(offset)
+      if records is None:
+        return
+
+      for record in records:
+        self.records += 1
+        yield record
+
+      # the last page is shorter than limit
+      if len(records) != self.page_size:
+        return
+      offset += self.page_size
+
+
+  def get_page(self, offset):
+    """get a page which starts from offset
+
+    Arguments:
+        offset {int} -- offset of the first record in the page
+
+    Returns:
+        list or None -- list of records, None if failed
+    """
+    params = self.params + [('offset', offset), ('limit', self.page_size)]
+    get_result = self.drc.get(api_path=self.api_path, params=params)
+    records = self.drc.extract_data_response(get_result)
+    if not get_result or get_result.get('failed') or not isinstance(records, list):
+      self.failed = True
+      self.msg = 'failed to get page of {} at offset {}'.format(self.api_path, offset)
+      logging.error(self.msg)
+      return None
+
+    self.pages += 1
+    if self.fields:
+      # trim records as soon as the page is parsed
+      records = [self.drc.project_fields(record, self.fields) for record in records]
+    return records
+
+
+
 if __name__ == '__main__':
 
   from dnac_sandbox import sandbox_params
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Journal of async tasks submitted without waiting.
+
+  one json object per line
+
+  {"task_id": "85c95140-...", "host": "sandboxdnac2.cisco.com", "username": "devnetuser",
+   "method": "POST", "api_path": "/api/v1/group", "submitted": 1578900000.123}
+
+"""
+
+import fcntl
+import json
+import logging
+
+try:
+  from dnac_file_util import atomic_write
+except ImportError:
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_file_util import atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class DnacTaskJournal:
+  """Journal file of task ids
+  """
+
+  def __init__(self, path):
+    """constructor for DnacTaskJournal class
+
+    Arguments:
+        path {str} -- path of the journal file
+    """
+    self.path = path
+    self.lock_path = path + '.lock'
+
+
+  def append(self, entry):
+    """Append an entry.
+
+    Arguments:
+        entry {dict} -- task entry
+    """
+    with open(self.lock_path, 'a', encoding='UTF-8') as lock_file:
+      fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+      try:
+        with open(self.path, 'a', encoding='UTF-8') as f:
+          f.write(json.dumps(entry) + '\n')
+      finally:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+  def load(self, host=None, username=None):
+    """Load entries.
+
+    Keyword Arguments:
+        host {str} -- filter by host (default: {None})
+        username {str} -- filter by username (default: {None})
+
+    Returns:
+        list -- list of entry
+    """
+    entries = []
+    try:
+      with open(self.path, encoding='UTF-8') as f:
+        for line in f:
+          line = line.strip()
+          if not line:
+            continue
+          try:
+            entries.append(json.loads(line))
+          except ValueError:
+            logging.warning("broken line in %s", self.path)
+    except FileNotFoundError:
+      return []
+
+    if host is not None:
+      entries = [e for e in entries if e.get('host') == host]
+    if username is not None:
+      entries = [e for e in entries if e.get('username') == username]
+    return entries
+
+
+  def remove(self, task_ids):
+    """Remove entries of task_ids.
+
+    Arguments:
+        task_ids {list} -- list of task id
+    """
+    task_ids = set(task_ids)
+    if not task_ids:
+      return
+
+    with open(self.lock_path, 'a', encoding='UTF-8') as lock_file:
+      fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+      try:
+        entries = [e for e in self.load() if e.get('task_id') not in task_ids]
+        atomic_write(self.path, ''.join(json.dumps(entry) + '\n' for entry in entries))
+      finally:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
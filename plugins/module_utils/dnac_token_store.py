@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Token store of Cisco DNA Center, one json file per controller.
+
+  {
+    "sandboxdnac2.cisco.com.devnetuser": {
+      "token": "eyJ0eXAiOiJKV1QiLCJhb...snipped...",
+      "exp": 1575109548
+    }
+  }
+
+  The file is written to a temporary file and then renamed,
+  so readers always see complete content without lock.
+  Expired entries are evicted on every write.
+
+"""
+
+import fcntl
+import json
+import logging
+import os
+import time
+
+try:
+  from dnac_file_util import atomic_write, safe_name
+except ImportError:
+  from ansible_collections.iida.dnac.plugins.module_utils.dnac_file_util import atomic_write, safe_name
+
+logger = logging.getLogger(__name__)
+
+
+class DnacTokenStore:
+  """Token store backed by json file
+  """
+
+  def __init__(self, log_dir, app_name, host):
+    """constructor for DnacTokenStore class
+
+    Arguments:
+        log_dir {str} -- directory of the token file
+        app_name {str} -- prefix of the file name
+        host {str} -- target hostname fqdn or ip addr
+    """
+    # ipv6 address or something else might contain ':'
+    self.path = os.path.join(log_dir, "{}.{}.json".format(app_name, safe_name(host)))
+
+    # serialize writers, readers never take this lock
+    self.lock_path = self.path + '.lock'
+
+
+  def load(self):
+    """Load all entries.
+
+    Returns:
+        dict -- entries, empty if not found
+    """
+    try:
+      with open(self.path, encoding='UTF-8') as f:
+        data = json.load(f)
+    except FileNotFoundError:
+      return {}
+    except (IOError, ValueError) as e:
+      logging.exception(e)
+      return {}
+
+    if not isinstance(data, dict):
+      return {}
+    return data
+
+
+  def get(self, key):
+    """Get token and expiration date.
+
+    Arguments:
+        key {str} -- URL + '.' + username
+
+    Returns:
+        tuple -- (token, exp), (None, None) if not found
+    """
+    entry = self.load().get(key)
+    if not isinstance(entry, dict):
+      return None, None
+    return entry.get('token'), entry.get('exp')
+
+
+  def put(self, key, token, exp):
+    """Save token and its expiration date.
+
+    Arguments:
+        key {str} -- URL + '.' + username
+        token {str} -- token string
+        exp {int} -- expiration date in epoch seconds
+    """
+    self.update(key, {'token': token, 'exp': exp})
+
+
+  def remove(self, key):
+    """Remove the token.
+
+    Arguments:
+        key {str} -- URL + '.' + username
+    """
+    self.update(key, None)
+
+
+  def update(self, key, entry):
+    """Replace an entry and write the file atomically.
+
+    Arguments:
+        key {str} -- URL + '.' + username
+        entry {dict} -- new entry, None to remove
+    """
+    with open(self.lock_path, 'a', encoding='UTF-8') as lock_file:
+      fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+      try:
+        data = self.load()
+        if entry is None:
+          data.pop(key, None)
+        else:
+          data[key] = entry
+        self.write(self.evict(data))
+      finally:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+  @staticmethod
+  def evict(data):
+    """Remove expired entries.
+
+    Arguments:
+        data {dict} -- entries
+
+    Returns:
+        dict -- entries which are not expired yet
+    """
+    now = time.time()
+    return {k: v for k, v in data.items() if isinstance(v, dict) and (v.get('exp') or 0) > now}
+
+
+  def write(self, data):
+    """Write entries to temporary file and rename it.
+
+    Arguments:
+        data {dict} -- entries
+    """
+    try:
+      atomic_write(self.path, json.dumps(data), mode=0o600)
+    except (IOError, OSError) as e:
+      logging.exception(e)
@@ -0,0 +1,88 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-module-docstring
+
+# (c) 2019, Takamitsu IIDA (@takamitsu-iida)
+
+ANSIBLE_METADATA = {'metadata_version': '0.1', 'status': ['preview'], 'supported_by': 'community'}
+
+DOCUMENTATION = '''
+---
+module: iida.dnac.device_config
+
+version_added: 2.9
+
+short_description: Save running config of all devices from Cisco DNA Center
+
+description:
+  - Get running config of all devices with one request and save them to files.
+  - The response is parsed incrementally and written to files one by one,
+    so the memory usage does not grow with the number of devices.
+  - Only paths, sizes and hashes are returned.
+  - The hash of each config is kept in manifest.json in C(dest),
+    and only the configs changed since the last run are written.
+
+options:
+  dest:
+    description:
+      - Directory to save the configs. C(log_dir)/config if omitted.
+    type: path
+
+author:
+  - Takamitsu IIDA (@takamitsu-iida)
+
+notes:
+  - Tested against devnet sandbox
+'''
+
+EXAMPLES = '''
+- name: save running config of all devices
+  iida.dnac.device_config:
+    dest: ./backup
+  register: r
+'''
+
+RETURN = '''
+config_list:
+  description: list of config with id, path, size, sha256, timestamp and changed
+  returned: success
+  type: list
+changed_devices:
+  description: device ids whose config changed since the last run
+  returned: success
+  type: list
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.connection import Connection
+
+# import from collection
+from ansible_collections.iida.dnac.plugins.module_utils.dnac_devices import DnacDevices as DnacRestClient
+
+
+def main():
+  """main entry point for module execution"""
+
+  # module argument
+  argument_spec = DnacRestClient.device_config_argument_spec
+
+  # generate module instance
+  module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+  # generate DnacRestClient instance
+  drc = DnacRestClient(module.params)
+
+  # send requests via the persistent connection of httpapi plugin
+  if module._socket_path:  # pylint: disable=protected-access
+    connection = Connection(module._socket_path)  # pylint: disable=protected-access
+    if drc.is_dnac_connection(connection):
+      drc.connection(connection)
+
+  # execute module
+  result = drc.execute_module_device_config(module.check_mode)
+
+  module.exit_json(**result)
+
+
+if __name__ == '__main__':
+  main()
@@ -25,12 +25,56 @@ notes:
 '''
 
 EXAMPLES = '''
+- name: look up many devices in one task
+  iida.dnac.get_devices:
+    ip:
+      - 10.0.0.1
+      - 10.0.0.2
+  register: r
+
+- name: get interfaces, licenses and config of all devices, at most 16 requests in flight
+  iida.dnac.get_devices:
+    max_inflight: 16
+    details:
+      - interfaces
+      - licenses
+      - config
+      - interface:GigabitEthernet1/0/1
+
+- name: reachable access switches, only a few keys per device
+  iida.dnac.get_devices:
+    family: Switches and Hubs
+    role: ACCESS
+    reachability_status: Reachable
+    hostname: "T1-*"
+    fields:
+      - hostname
+      - managementIpAddress
+      - serialNumber
+  register: r
 '''
 
 RETURN = '''
+device_list:
+  description: list of devices found
+  returned: success
+  type: list
+devices:
+  description: device keyed by the value of ip, id or serial, null if not found
+  returned: when ip, id or serial is specified
+  type: dict
+not_found:
+  description: values of ip, id or serial which did not match any device
+  returned: when ip, id or serial is specified
+  type: list
+device_table:
+  description: devices in column oriented form, {"columns": [...], "rows": [[...], ...]}
+  returned: when compact is true and none of ip, id or serial is specified
+  type: dict
 '''
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.connection import Connection
 
 # import from collection
 from ansible_collections.iida.dnac.plugins.module_utils.dnac_devices import DnacDevices as DnacRestClient
@@ -39,13 +83,8 @@ from ansible_collections.iida.dnac.plugins.module_utils.dnac_devices import Dnac
 def main():
   """main entry point for module execution"""
 
-  argument_spec = dict(DnacRestClient.argument_spec)
-  argument_spec.update(
-    dict(
-      ip=dict(type='str'),
-      id=dict(type='str'),
-      serial=dict(type='str')
-    ))
+  # module argument
+  argument_spec = DnacRestClient.get_devices_argument_spec
 
   # generate module instance
   module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
@@ -53,6 +92,12 @@ def main():
   # generate DnacRestClient instance
   drc = DnacRestClient(module.params)
 
+  # send requests via the persistent connection of httpapi plugin
+  if module._socket_path:  # pylint: disable=protected-access
+    connection = Connection(module._socket_path)  # pylint: disable=protected-access
+    if drc.is_dnac_connection(connection):
+      drc.connection(connection)
+
   # execute module
   result = drc.execute_module_get_devices(module.check_mode)
 
@@ -0,0 +1,115 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-module-docstring
+
+# (c) 2019, Takamitsu IIDA (@takamitsu-iida)
+
+ANSIBLE_METADATA = {'metadata_version': '0.1', 'status': ['preview'], 'supported_by': 'community'}
+
+DOCUMENTATION = '''
+---
+module: iida.dnac.site_hierarchy
+
+version_added: 2.9
+
+short_description: Create or delete whole site hierarchy of Cisco DNA Center
+
+description:
+  - Compare desired tree of areas, buildings and floors with current groups in DNA Center,
+    and then delete (children first) and create (parents first) them in one task.
+  - Sites at the same depth are processed concurrently by C(workers) threads.
+
+options:
+  sites:
+    description:
+      - List of site. Each site has C(name), C(type) (area, building or floor),
+        C(building_info) (required for building), C(state) (present or absent, inherited by children)
+        and C(children).
+    type: list
+    required: true
+  parent:
+    description:
+      - groupNameHierarchy of the root of the tree.
+    type: str
+    default: Global
+
+author:
+  - Takamitsu IIDA (@takamitsu-iida)
+
+notes:
+  - Tested against devnet sandbox
+'''
+
+EXAMPLES = '''
+- name: create site hierarchy
+  iida.dnac.site_hierarchy:
+    workers: 4
+    sites:
+      - name: iida
+        type: area
+        children:
+          - name: ksg-tp
+            type: building
+            building_info:
+              address: "神奈川県川崎市中原区小杉町1-403"
+              latitude: "35.577510"
+              longitude: "139.658149"
+            children:
+              - name: ksg-tp-18f
+                type: floor
+      - name: old-area
+        state: absent
+  register: r
+'''
+
+RETURN = '''
+sites:
+  description: change report per site
+  returned: always
+  type: list
+  sample: |
+    [
+      {
+        "name": "iida",
+        "type": "area",
+        "hierarchy": "Global/iida",
+        "action": "create",
+        "changed": true,
+        "failed": false
+      }
+    ]
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.connection import Connection
+
+# import from collection
+from ansible_collections.iida.dnac.plugins.module_utils.dnac_group import DnacGroup as DnacRestClient
+
+
+def main():
+  """main entry point for module execution"""
+
+  # module argument
+  argument_spec = DnacRestClient.site_hierarchy_argument_spec
+
+  # generate module instance
+  module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+  # generate DnacRestClient instance
+  drc = DnacRestClient(module.params)
+
+  # send requests via the persistent connection of httpapi plugin
+  if module._socket_path:  # pylint: disable=protected-access
+    connection = Connection(module._socket_path)  # pylint: disable=protected-access
+    if drc.is_dnac_connection(connection):
+      drc.connection(connection)
+
+  # execute module
+  result = drc.execute_module_site_hierarchy(module.check_mode)
+
+  module.exit_json(**result)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,95 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+# pylint: disable=missing-module-docstring
+
+# (c) 2019, Takamitsu IIDA (@takamitsu-iida)
+
+ANSIBLE_METADATA = {'metadata_version': '0.1', 'status': ['preview'], 'supported_by': 'community'}
+
+DOCUMENTATION = '''
+---
+module: iida.dnac.task_status
+
+version_added: 2.9
+
+short_description: Collect the result of async tasks of Cisco DNA Center
+
+description:
+  - Wait for the tasks submitted with C(task_wait=false) and return their results.
+  - The task ids are read from the journal in C(log_dir) if C(task_ids) is not specified.
+  - Tasks which did not end within C(task_timeout) are kept in the journal as pending.
+
+options:
+  task_ids:
+    description:
+      - List of task id to collect. All tasks in the journal for the host and user if omitted.
+    type: list
+  purge:
+    description:
+      - Remove ended tasks from the journal.
+    type: bool
+    default: true
+
+author:
+  - Takamitsu IIDA (@takamitsu-iida)
+
+notes:
+  - Tested against devnet sandbox
+'''
+
+EXAMPLES = '''
+- name: create sites without waiting
+  iida.dnac.site_hierarchy:
+    task_wait: false
+    sites: "{{ sites }}"
+
+- name: collect the results
+  iida.dnac.task_status:
+    task_timeout: 600
+  register: r
+'''
+
+RETURN = '''
+tasks:
+  description: result per task id, with elapsed seconds and the number of polls
+  returned: always
+  type: dict
+pending:
+  description: task ids which did not end within task_timeout
+  returned: always
+  type: list
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.connection import Connection
+
+# import from collection
+from ansible_collections.iida.dnac.plugins.module_utils.dnac_rest_client import DnacRestClient
+
+
+def main():
+  """main entry point for module execution"""
+
+  # module argument
+  argument_spec = DnacRestClient.task_status_argument_spec
+
+  # generate module instance
+  module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+  # generate DnacRestClient instance
+  drc = DnacRestClient(module.params)
+
+  # send requests via the persistent connection of httpapi plugin
+  if module._socket_path:  # pylint: disable=protected-access
+    connection = Connection(module._socket_path)  # pylint: disable=protected-access
+    if drc.is_dnac_connection(connection):
+      drc.connection(connection)
+
+  # execute module
+  result = drc.execute_module_task_status(module.check_mode)
+
+  module.exit_json(**result)
+
+
+if __name__ == '__main__':
+  main()
@@ -52,6 +52,7 @@ response:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.connection import Connection
 
 # import from collection
 from ansible_collections.iida.dnac.plugins.module_utils.dnac_rest_client import DnacRestClient
@@ -61,13 +62,20 @@ def main():
   """main entry point for module execution"""
 
   # module argument
-  argument_spec = dict(DnacRestClient.argument_spec)
+  argument_spec = DnacRestClient.token_argument_spec
 
   # generate module instance
   module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
 
   # generate DnacRestClient instance
   drc = DnacRestClient(module.params)
+
+  # send requests via the persistent connection of httpapi plugin
+  if module._socket_path:  # pylint: disable=protected-access
+    connection = Connection(module._socket_path)  # pylint: disable=protected-access
+    if drc.is_dnac_connection(connection):
+      drc.connection(connection)
+
   result = drc.execute_module_token(module.check_mode)
   module.exit_json(**result)
 